@@ -5,9 +5,68 @@ from .models import User, Store, Product, Order, OrderItem, DailyPlan, DailyPlan
 admin.site.register(User)
 admin.site.register(Store)
 admin.site.register(Product)
-admin.site.register(Order)
-admin.site.register(OrderItem)
 admin.site.register(DailyPlan)
-admin.site.register(DailyPlanStore)
-admin.site.register(Log)
-admin.site.register(StoreMetrics)
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for Order.
+    Joins the store and merchandiser so rendering a changelist page does not issue a query per row.
+    """
+    list_display = ('id', 'store', 'merchandiser', 'status', 'order_date')
+    list_select_related = ('store', 'merchandiser')
+    raw_id_fields = ('store', 'merchandiser')
+    list_per_page = 50
+    show_full_result_count = False  # Skip the extra unfiltered COUNT(*) on large tables
+
+
+@admin.register(OrderItem)
+class OrderItemAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for OrderItem.
+    OrderItem.__str__ touches the product and the parent order, so both are joined up front.
+    """
+    list_display = ('id', 'order', 'product', 'quantity', 'price_per_unit')
+    list_select_related = ('order', 'order__store', 'order__merchandiser', 'product')
+    raw_id_fields = ('order', 'product')
+    list_per_page = 50
+    show_full_result_count = False
+
+
+@admin.register(DailyPlanStore)
+class DailyPlanStoreAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for DailyPlanStore.
+    Joins the parent plan (with its merchandiser) and the visited store.
+    """
+    list_display = ('id', 'daily_plan', 'store', 'visit_order', 'completed', 'visited_at')
+    list_select_related = ('daily_plan', 'daily_plan__merchandiser', 'store')
+    raw_id_fields = ('daily_plan', 'store')
+    list_per_page = 50
+    show_full_result_count = False
+
+
+@admin.register(StoreMetrics)
+class StoreMetricsAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for StoreMetrics.
+    """
+    list_display = ('id', 'store', 'date', 'total_orders_count', 'total_quantity_ordered', 'average_order_amount')
+    list_select_related = ('store',)
+    raw_id_fields = ('store',)
+    list_per_page = 50
+    show_full_result_count = False
+
+
+@admin.register(Log)
+class LogAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for Log.
+    The audit log grows without bound, so the full result count is not computed.
+    """
+    list_display = ('id', 'user', 'action', 'timestamp')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    list_per_page = 50
+    show_full_result_count = False
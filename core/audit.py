@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
+from core.models import Log
+
+# Entries of the current batched_log_writes() block whose transaction has committed, or None outside a block
+_pending_entries = ContextVar('pending_log_entries', default=None)
+
+
+def log_action(user, action, details=None):
+    """
+    Records a user action in the Log table.
+    The entry is kept once the current transaction commits (immediately outside a transaction),
+    so a rolled back request does not log anything.
+    Inside batched_log_writes() (every request, see core.middleware.AuditLogBufferMiddleware) the kept entries
+    are written together when the block ends; elsewhere each entry is written on its own.
+    :param user: The User who performed the action (or None).
+    :param action: A brief description of the action, e.g. 'order_created'.
+    :param details: JSON-serializable dictionary with the details of the action.
+    """
+    entry = Log(user=user, action=action, details=details)
+    transaction.on_commit(lambda: _keep(entry))
+
+
+def _keep(entry):
+    """
+    Adds a committed entry to the active batch, or writes it right away when there is none.
+    :param entry: The unsaved Log instance.
+    """
+    pending_entries = _pending_entries.get()
+    if pending_entries is None:
+        entry.save()
+    else:
+        pending_entries.append(entry)
+
+
+@contextmanager
+def batched_log_writes():
+    """
+    Collects the entries logged inside the block and writes them with one bulk_create when it ends.
+    Entries of committed work are written even if the block raises afterwards.
+    Nested blocks join the outer batch.
+    """
+    if _pending_entries.get() is not None:
+        yield
+        return
+
+    pending_entries = []
+    token = _pending_entries.set(pending_entries)
+    try:
+        yield
+    finally:
+        _pending_entries.reset(token)
+        if pending_entries:
+            Log.objects.bulk_create(pending_entries, batch_size=500)
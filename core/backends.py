@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class EmailOrUsernameModelBackend(ModelBackend):
+    """
+    Authentication backend that accepts either a username or an email address.
+    Resolves the user with a single indexed query, so login does not need a separate lookup
+    before calling authenticate(). Permission checks are inherited from ModelBackend.
+    """
+
+    def authenticate(self, request, username=None, password=None, email=None, **kwargs):
+        """
+        Authenticates a user by username (case-sensitive) or, when no username is given, by email
+        (case-insensitive, served by the UPPER(email) index).
+        :param request: The current HTTP request, if any.
+        :param username: The username to log in with.
+        :param password: The raw password.
+        :param email: The email address to log in with, used when username is not provided.
+        :return: The authenticated User instance, or None.
+        """
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if password is None or (not username and not email):
+            return None
+
+        if username:
+            user = user_model._default_manager.filter(**{user_model.USERNAME_FIELD: username}).first()
+        else:
+            user = user_model._default_manager.filter(email__iexact=email).order_by('pk').first()
+
+        if user is None:
+            # Run the default password hasher once to reduce the timing difference between
+            # an existing and a nonexistent user (see ModelBackend.authenticate)
+            user_model().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,102 @@
+import hashlib
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from core.models import Store
+
+# Store coordinates rarely change, and every change invalidates the entry (see core.signals).
+# Note: with the default per-process local-memory cache, an edit made in another worker process is only
+# picked up once the entry expires; configure a shared backend in CACHES for immediate invalidation.
+ROUTE_STORE_CACHE_TIMEOUT = 60 * 60
+_ROUTE_STORE_FIELDS = ('name', 'address', 'latitude', 'longitude')
+
+
+def _route_store_key(store_id):
+    """
+    Returns the cache key holding the routing data of a store.
+    """
+    return f'route_store:{store_id}'
+
+
+def get_route_stores(store_ids):
+    """
+    Returns the stores needed to calculate a route, served from the cache where possible.
+    Stores missing from the cache are loaded with one query (only the routing columns) and cached.
+    The returned Store instances only carry the id, name, address and coordinates, and are meant for reading.
+    :param store_ids: Iterable of Store IDs.
+    :return: Dictionary mapping each existing store ID to its Store instance.
+    """
+    keys = {_route_store_key(store_id): store_id for store_id in set(store_ids)}
+    if not keys:
+        return {}
+
+    stores = {
+        keys[key]: Store(id=keys[key], **dict(zip(_ROUTE_STORE_FIELDS, values)))
+        for key, values in cache.get_many(keys).items()
+    }
+    missing_ids = keys.values() - stores.keys()
+    if missing_ids:
+        loaded = Store.objects.only('id', *_ROUTE_STORE_FIELDS).in_bulk(missing_ids)
+        cache.set_many(
+            {_route_store_key(pk): tuple(getattr(store, name) for name in _ROUTE_STORE_FIELDS)
+             for pk, store in loaded.items()},
+            timeout=ROUTE_STORE_CACHE_TIMEOUT
+        )
+        stores.update(loaded)
+    return stores
+
+
+def invalidate_route_stores(store_ids):
+    """
+    Removes the cached routing data of the given stores.
+    :param store_ids: Iterable of Store IDs.
+    """
+    cache.delete_many([_route_store_key(store_id) for store_id in store_ids])
+
+
+# The pre-calculated metrics change when SaveStoreMetricsAPIView runs (typically once a day), or when a store is
+# renamed. Cached lists are keyed by a version that every such change replaces, so one write drops all of them.
+# Same caveat as above: with the local-memory cache, other worker processes see the change once the entries expire.
+STORE_METRICS_CACHE_TIMEOUT = 60 * 60
+_STORE_METRICS_VERSION_KEY = 'store_metrics:version'
+
+
+def store_metrics_list_key(query_params):
+    """
+    Returns the cache key holding the store metrics list for the given filters.
+    :param query_params: The request's query parameters.
+    :return: Cache key for the current version of the metrics.
+    """
+    version = cache.get(_STORE_METRICS_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        cache.add(_STORE_METRICS_VERSION_KEY, version, timeout=None)
+        version = cache.get(_STORE_METRICS_VERSION_KEY, version)
+    # Hashed so the key stays short (and valid for memcached) whatever the query string holds
+    params = hashlib.md5(urlencode(sorted(query_params.lists()), doseq=True).encode()).hexdigest()
+    return f'store_metrics:{version}:{params}'
+
+
+def invalidate_store_metrics():
+    """
+    Drops every cached store metrics list by starting a new version.
+    """
+    cache.set(_STORE_METRICS_VERSION_KEY, uuid4().hex, timeout=None)
+
+
+# Routing service answers for a given URL (service, ordered coordinates, options) only change with the road
+# network, so they are kept for a while and expire by timeout. Routes with many points are rarely requested twice
+# and make large entries, so they are not cached.
+OSRM_CACHE_TIMEOUT = 60 * 60
+OSRM_CACHE_MAX_POINTS = 50
+
+
+def osrm_response_key(osrm_url):
+    """
+    Returns the cache key holding the routing service's response for a request URL.
+    :param osrm_url: The full URL of the routing service request.
+    :return: Cache key for the response.
+    """
+    return f'osrm:{hashlib.sha1(osrm_url.encode()).hexdigest()}'
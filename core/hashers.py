@@ -0,0 +1,24 @@
+from functools import lru_cache
+
+from django.contrib.auth.hashers import get_hasher
+
+
+@lru_cache(maxsize=None)
+def _default_hasher():
+    """
+    Returns the default password hasher, resolved once per process.
+    Note: the cached hasher ignores later runtime changes to settings.PASSWORD_HASHERS.
+    """
+    return get_hasher('default')
+
+
+def hash_password(raw_password):
+    """
+    Hashes a raw password with the cached default hasher.
+    Intended for server-controlled bulk user creation, where resolving the hasher for every user adds up.
+    Single-user paths should keep using User.set_password().
+    :param raw_password: The plain-text password.
+    :return: The encoded password, ready to be assigned to User.password.
+    """
+    hasher = _default_hasher()
+    return hasher.encode(raw_password, hasher.salt())
@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.audit import log_action
+from core.metrics import save_store_metrics
+
+
+class Command(BaseCommand):
+    """
+    Calculates and saves the metrics of every store for one day (today by default).
+    Meant to be run by a scheduler (e.g. a nightly cron entry), so the aggregation over all stores
+    runs outside the HTTP workers and is not bound by their request timeouts.
+    """
+    help = "Calculates and saves the metrics of every store for a date (YYYY-MM-DD, today by default)."
+
+    def add_arguments(self, parser):
+        """
+        Adds the optional --date argument.
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument('--date', help="Date to save the metrics for (YYYY-MM-DD). Defaults to today.")
+
+    def handle(self, *args, **options):
+        """
+        Saves the metrics and records the action in the log.
+        :raises CommandError: If the date is not in YYYY-MM-DD format.
+        """
+        if options['date']:
+            try:
+                target_day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("Invalid date format. Use YYYY-MM-DD.")
+        else:
+            target_day = timezone.localdate()
+
+        saved_count = save_store_metrics(target_day)
+        log_action(user=None, action='metrics_saved',
+                   details={'date_saved_for': target_day.isoformat(), 'number_of_stores': saved_count,
+                            'saved_by': 'save_store_metrics command'})
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully calculated and saved metrics for {saved_count} stores for {target_day}."
+        ))
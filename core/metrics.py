@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models import Avg, Count, DecimalField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+
+from core.cache import invalidate_store_metrics
+from core.models import OrderItem, Store, StoreMetrics
+
+# Number of stores read per database round trip and upserted per INSERT statement
+SAVE_METRICS_BATCH_SIZE = 1000
+
+
+def save_store_metrics(target_day):
+    """
+    Calculates the metrics of every store for one day and saves them into StoreMetrics,
+    replacing the metrics previously saved for that day.
+    Shared by SaveStoreMetricsAPIView and the save_store_metrics management command (for cron).
+    :param target_day: The date to calculate the metrics for.
+    :return: The number of stores whose metrics were saved.
+    """
+    # Same shape as CalculateStoreMetricsAPIView (core.views.metrics): the order filter is built once and shared
+    # by the count and the average, which come from one LEFT JOIN + GROUP BY; the item quantity stays a subquery
+    orders_on_day = Q(orders__order_date=target_day)
+    metrics_data = Store.objects.values('id').annotate(
+        # Metric 1: Total number of orders for the store
+        total_orders_count=Count('orders', filter=orders_on_day),
+
+        # Metric 2: Total quantity of all items sold in the store's orders
+        total_quantity_ordered=Coalesce(
+            Subquery(
+                OrderItem.objects.filter(
+                    order__store=OuterRef("pk"),
+                    order__order_date=target_day,
+                )
+                .values("order__store")
+                .annotate(total=Sum("quantity"))
+                .values("total")
+            ),
+            0,
+        ),
+
+        # Metric 3: Average order amount for the store
+        average_order_amount=Coalesce(
+            Round(Avg('orders__total_amount', filter=orders_on_day), 2),
+            0.0,
+            output_field=DecimalField(),
+        ),
+    ).values('id', 'total_orders_count', 'total_quantity_ordered', 'average_order_amount')
+
+    # Rows are read from a (server-side) cursor and upserted in batches, so neither the stores' rows nor the
+    # StoreMetrics instances are all held in memory at once.
+    # One INSERT ... ON CONFLICT (store_id, date) DO UPDATE per batch instead of a SELECT plus an
+    # UPDATE/INSERT per store; existing rows keep their created_at
+    saved_count = 0
+    batch = []
+    with transaction.atomic():
+        for row in metrics_data.iterator(chunk_size=SAVE_METRICS_BATCH_SIZE):
+            batch.append(StoreMetrics(
+                store_id=row['id'],
+                date=target_day,
+                total_orders_count=row['total_orders_count'],
+                total_quantity_ordered=row['total_quantity_ordered'],
+                average_order_amount=row['average_order_amount'],
+            ))
+            if len(batch) == SAVE_METRICS_BATCH_SIZE:
+                saved_count += _upsert_store_metrics(batch)
+                batch = []
+        if batch:
+            saved_count += _upsert_store_metrics(batch)
+    # bulk_create sends no post_save signals, so the cached lists are dropped here
+    invalidate_store_metrics()
+    return saved_count
+
+
+def _upsert_store_metrics(metrics):
+    """
+    Inserts store metrics, replacing the values of the rows already saved for the same store and date.
+    :param metrics: List of unsaved StoreMetrics instances.
+    :return: The number of upserted rows.
+    """
+    StoreMetrics.objects.bulk_create(
+        metrics,
+        update_conflicts=True,
+        unique_fields=['store', 'date'],
+        update_fields=['total_orders_count', 'total_quantity_ordered', 'average_order_amount', 'updated_at'],
+    )
+    return len(metrics)
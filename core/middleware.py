@@ -0,0 +1,23 @@
+from core.audit import batched_log_writes
+
+
+class AuditLogBufferMiddleware:
+    """
+    Writes the audit log entries of a request (core.audit.log_action) with one bulk INSERT
+    once the response is ready, instead of one INSERT per logged action.
+    """
+
+    def __init__(self, get_response):
+        """
+        :param get_response: The next middleware or the view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Handles the request with log writes batched until the response is returned.
+        :param request: The HTTP request object.
+        :return: The response of the view.
+        """
+        with batched_log_writes():
+            return self.get_response(request)
@@ -1,6 +1,11 @@
+from decimal import Decimal
+
 from django.contrib.auth.models import AbstractUser
-from django.core.validators import MinValueValidator
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Upper
 
 
 class User(AbstractUser):
@@ -14,11 +19,15 @@ class User(AbstractUser):
         ('merchandiser', 'Merchandiser'),
         ('manager', 'Manager'),
     )
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='merchandiser')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='merchandiser', db_index=True)
 
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        # email__iexact compiles to UPPER(email) = UPPER(%s); this expression index lets login by email seek.
+        indexes = [
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+        ]
 
     def __str__(self):
         """
@@ -32,11 +41,14 @@ class Store(models.Model):
     Represents a retail store where confectionery products are delivered.
     Includes geographical coordinates for map visualization.
     """
-    name = models.CharField(max_length=255)
+    # Indexed because the store list, the map and the calculated metrics are all ordered by name
+    name = models.CharField(max_length=255, db_index=True)
     address = models.CharField(max_length=255)
-    # latitude and longitude are nullable as they might not be available for all stores initially
-    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
-    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # latitude and longitude are nullable as they might not be available for all stores initially.
+    # Stored as double precision: ~15 significant digits is ample for coordinates and avoids Decimal overhead.
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True,
+                                  validators=[MinValueValidator(-180), MaxValueValidator(180)])
     contact_person_name = models.CharField(max_length=100, blank=True, null=True)
     contact_person_phone = models.CharField(max_length=20, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -102,6 +114,12 @@ class Order(models.Model):
     class Meta:
         verbose_name = "Order"
         verbose_name_plural = "Orders"
+        # Covers the common "orders for a store / merchandiser in a date range" lookups and status filtering.
+        indexes = [
+            models.Index(fields=['store', 'order_date']),
+            models.Index(fields=['merchandiser', 'order_date']),
+            models.Index(fields=['status']),
+        ]
 
     def __str__(self):
         """
@@ -109,14 +127,39 @@ class Order(models.Model):
         """
         return f"Order #{self.id} for {self.store.name} by {self.merchandiser.username}"
 
-    def calculate_total_amount(self):
+    def calculate_total_amount(self, items=None):
         """
         Calculates and updates the total amount of the order based on its OrderItems.
         This method should be called when order items are added or changed.
+        Without items, the sum is computed and written by the database in a single
+        UPDATE ... SET total_amount = (subquery), then only the total_amount column is reloaded.
+        :param items: Optional complete list of the order's items already held in memory (e.g. just written
+                      by the caller). The sum is then taken from them and written without reading the row back.
         """
-        total = sum(item.quantity * item.price_per_unit for item in self.items.all())
+        if items is None:
+            Order.recalculate_totals([self.pk])
+            self.refresh_from_db(fields=['total_amount'])
+            return
+
+        total = sum((item.quantity * item.price_per_unit for item in items), Decimal('0.00'))
+        Order.objects.filter(pk=self.pk).update(total_amount=total)
         self.total_amount = total
-        self.save()
+
+    @classmethod
+    def recalculate_totals(cls, order_ids):
+        """
+        Recalculates the total amount of many orders with a single UPDATE ... SET total_amount = (subquery).
+        Use this instead of calling calculate_total_amount() in a loop for batch jobs.
+        :param order_ids: Iterable of Order IDs to recalculate.
+        :return: Number of updated orders.
+        """
+        amount_field = DecimalField(max_digits=12, decimal_places=2)
+        items_total = OrderItem.objects.filter(order=OuterRef('pk')).values('order').annotate(
+            total=Sum(F('quantity') * F('price_per_unit'), output_field=amount_field)
+        ).values('total')
+        return cls.objects.filter(id__in=order_ids).update(
+            total_amount=Coalesce(Subquery(items_total), Value(0), output_field=amount_field)
+        )
 
 
 class OrderItem(models.Model):
@@ -147,6 +190,23 @@ class OrderItem(models.Model):
         """
         return f"{self.quantity} x {self.product.name} in Order #{self.order.id}"
 
+    @classmethod
+    def bulk_add(cls, order, items_data, batch_size=500):
+        """
+        Adds many items to a new order with a multi-row INSERT and writes the order total once.
+        Both steps run in one transaction, so a failure leaves the order without partial items.
+        The created items are the order's complete item list, so the total is summed from them in memory.
+        :param order: The Order instance to add items to. It must not have items yet.
+        :param items_data: List of dictionaries with product, quantity and price_per_unit.
+        :param batch_size: Maximum number of rows per INSERT statement.
+        :return: List of created OrderItem instances.
+        """
+        with transaction.atomic():
+            created_items = cls.objects.bulk_create([cls(order=order, **item_data) for item_data in items_data],
+                                                    batch_size=batch_size)
+            order.calculate_total_amount(items=created_items)
+        return created_items
+
 
 class DailyPlan(models.Model):
     """
@@ -193,6 +253,10 @@ class DailyPlanStore(models.Model):
         verbose_name_plural = "Daily Plan Stores"
         # Orders visits by their sequence in the plan.
         ordering = ['visit_order']
+        # Matches the default ordering when listing the visits of a single plan.
+        indexes = [
+            models.Index(fields=['daily_plan', 'visit_order']),
+        ]
 
     def __str__(self):
         """
@@ -221,6 +285,18 @@ class Log(models.Model):
         verbose_name_plural = "Logs"
         # Orders log entries by the newest first.
         ordering = ['-timestamp']
+        indexes = [
+            # Column order and direction match "logs for a user, newest first".
+            models.Index(fields=['user', '-timestamp']),
+            # Serves the keyset pagination of the log list (ORDER BY timestamp DESC, id DESC).
+            models.Index(fields=['-timestamp', '-id']),
+            # Serves the log list's action filter (action__iexact compiles to UPPER(action) = UPPER(%s)),
+            # newest first.
+            models.Index(Upper('action'), F('timestamp').desc(), name='log_action_upper_ts_idx'),
+            # Serves containment lookups such as details__contains={'order_id': 123}.
+            # jsonb_path_ops only supports @>, which keeps the index smaller and faster than the default opclass.
+            GinIndex(fields=['details'], name='log_details_gin_idx', opclasses=['jsonb_path_ops']),
+        ]
 
     def __str__(self):
         """
@@ -253,6 +329,12 @@ class StoreMetrics(models.Model):
         unique_together = ('store', 'date')
         # Orders metrics by the newest date first.
         ordering = ['-date']
+        # (store, date) is already indexed by unique_together; this one serves "newest metrics for a store".
+        indexes = [
+            models.Index(fields=['store', '-date']),
+            # Serves the unfiltered and date-filtered metrics list (ORDER BY date DESC).
+            models.Index(fields=['-date']),
+        ]
 
     def __str__(self):
         """
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class LogCursorPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination for the log list.
+    Each page continues from the last row of the previous one (WHERE timestamp < ... ORDER BY ... LIMIT),
+    so fetching a page costs the same no matter how deep it is, and no COUNT(*) runs over the log table.
+    DRF builds the cursor position from the timestamp alone (the first ordering field). Entries sharing the
+    position's timestamp are skipped with the cursor's offset, and the ID keeps their order the same from one
+    request to the next, so that offset always skips the same rows.
+    """
+    ordering = ('-timestamp', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -4,6 +4,7 @@ from rest_framework import permissions
 class IsManager(permissions.BasePermission):
     """
     Custom permission to only allow users with 'manager' role to access a view.
+    The result of the role check is cached on the request, so it is evaluated once per request.
     """
 
     def has_permission(self, request, view):
@@ -14,7 +15,7 @@ class IsManager(permissions.BasePermission):
         :return: True if the user is an authenticated manager, False otherwise.
         """
 
-        return request.user and request.user.is_authenticated and request.user.role == 'manager'
+        return self._is_manager(request)
 
     def has_object_permission(self, request, view, obj):
         """
@@ -26,4 +27,18 @@ class IsManager(permissions.BasePermission):
         :return: True if the user is an authenticated manager, False otherwise.
         """
 
-        return request.user and request.user.is_authenticated and request.user.role == 'manager'
+        return self._is_manager(request)
+
+    @staticmethod
+    def _is_manager(request):
+        """
+        Returns the cached role check for the request, computing it on first use.
+        :param request: The HTTP request object.
+        :return: True if the user is an authenticated manager, False otherwise.
+        """
+        cached = getattr(request, '_is_manager', None)
+        if cached is None:
+            user = request.user
+            cached = bool(user and user.is_authenticated and user.role == 'manager')
+            request._is_manager = cached
+        return cached
@@ -1,9 +1,56 @@
 from django.db import transaction
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from rest_framework import serializers
 
 from core.models import DailyPlan, DailyPlanStore, Store
 from core.serializers import StoreSerializer
+from core.serializers.fields import CachedPrimaryKeyRelatedField, PartialRepresentationMixin, PrefetchRelatedMixin
+
+
+def _validate_unique_visits(stores_data):
+    """
+    Checks in a single pass that no store and no visit order appears twice in a plan's visits.
+    :param stores_data: List of validated store visit dictionaries.
+    :raises serializers.ValidationError: On the first duplicate store or visit order found.
+    """
+    seen_stores = set()
+    seen_orders = set()
+    # Bound once: the loop body runs for every visit of the plan
+    add_store = seen_stores.add
+    add_order = seen_orders.add
+    for item in stores_data:
+        store_id = item['store'].id  # The store field always resolves to a Store instance
+        if store_id in seen_stores:
+            raise serializers.ValidationError({"stores": "Duplicate store found in the provided list for this plan."})
+        add_store(store_id)
+
+        visit_order = item.get('visit_order')
+        if visit_order is not None:
+            if visit_order in seen_orders:
+                raise serializers.ValidationError(
+                    {"stores": "Duplicate visit order found in the provided list for this plan."})
+            add_order(visit_order)
+
+
+class _MemoizedStoreSerializer(StoreSerializer):
+    """
+    StoreSerializer that renders each store once per request.
+    Plans listed together often visit the same stores, so the rendered data is memoized in the
+    shared serializer context by store ID and reused for every later visit to that store.
+    """
+
+    def to_representation(self, instance):
+        """
+        Returns the cached representation of the store, rendering it on first use.
+        :param instance: The Store instance.
+        :return: The serialized store data.
+        """
+        cache = self.context.setdefault('_store_details_cache', {})
+        data = cache.get(instance.pk)
+        if data is None:
+            data = cache[instance.pk] = super().to_representation(instance)
+        return data
 
 
 class DailyPlanStoreSerializer(serializers.ModelSerializer):
@@ -11,27 +58,20 @@ class DailyPlanStoreSerializer(serializers.ModelSerializer):
     Serializer for DailyPlanStore.
     Manages individual store visits within a daily plan.
     """
+    # Resolved from the stores preloaded by the parent serializer, so validating a plan costs one query
+    store = CachedPrimaryKeyRelatedField(
+        queryset=Store.objects.all(), cache_key='_store_cache',
+        error_messages={'does_not_exist': 'Store with ID {pk_value} does not exist.'}
+    )
     store_name = serializers.CharField(source='store.name', read_only=True)
-    store_details = serializers.SerializerMethodField(read_only=True)
+    # Nested serializer bound to obj.store, which is already loaded when the visits are fetched with
+    # select_related('store') (see DailyPlanSerializer.setup_eager_loading); memoized per request
+    store_details = _MemoizedStoreSerializer(source='store', read_only=True)
 
     class Meta:
         model = DailyPlanStore
-        fields = ['id', 'store', 'store_name', 'store_details', 'visit_order', 'visited_at', 'completed']
-        read_only_fields = ['id', 'store_name', 'store_details']
-
-    def validate_store(self, store_id):
-        """
-        Validates that the store exists.
-        :param store_id: The ID of the store.
-        :return: The Store instance.
-        :raises serializers.ValidationError: If store does not exist.
-        """
-        try:
-            if isinstance(store_id, Store):
-                store_id = store_id.id
-            return Store.objects.get(id=store_id)
-        except Store.DoesNotExist:
-            raise serializers.ValidationError(f"Store with ID {store_id} does not exist.")
+        fields = ('id', 'store', 'store_name', 'store_details', 'visit_order', 'visited_at', 'completed')
+        read_only_fields = ('id', 'store_name', 'store_details')
 
     def validate(self, data):
         """
@@ -43,18 +83,8 @@ class DailyPlanStoreSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"visit_order": "Visit order must be a positive integer."})
         return data
 
-    def get_store_details(self, obj):
-        """
-        Returns the full serialized Store object for store_details field.
-        This will include latitude and longitude if they are in StoreSerializer's fields.
-        :param obj: The DailyPlanStore instance.
-        :return: Serialized Store data.
-        """
-
-        return StoreSerializer(obj.store).data
-
 
-class DailyPlanSerializer(serializers.ModelSerializer):
+class DailyPlanSerializer(PartialRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer for DailyPlan.
     Used for displaying daily plan details, including nested store visits.
@@ -64,22 +94,33 @@ class DailyPlanSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DailyPlan
-        fields = ['id', 'merchandiser', 'merchandiser_username', 'plan_date', 'notes', 'stores', 'created_at',
-                  'updated_at']
-        read_only_fields = ['id', 'merchandiser', 'merchandiser_username', 'stores', 'created_at', 'updated_at']
+        fields = ('id', 'merchandiser', 'merchandiser_username', 'plan_date', 'notes', 'stores', 'created_at',
+                  'updated_at')
+        read_only_fields = ('id', 'merchandiser', 'merchandiser_username', 'stores', 'created_at', 'updated_at')
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Applies the joins and prefetches needed to serialize daily plans without per-row queries.
+        :param queryset: A DailyPlan queryset.
+        :return: The queryset with merchandiser joined and store visits (with their stores) prefetched.
+        """
+        return queryset.select_related('merchandiser').prefetch_related('stores__store')
 
-class DailyPlanCreateSerializer(serializers.ModelSerializer):
+
+class DailyPlanCreateSerializer(PrefetchRelatedMixin, serializers.ModelSerializer):
     """
     Serializer for creating new DailyPlan instances.
     Allows specifying associated store visits.
     """
     stores = DailyPlanStoreSerializer(many=True)
+    # Loads every store referenced in 'stores' with a single query before validation
+    prefetch_related_ids = {'_store_cache': ('stores', 'store', Store)}
 
     class Meta:
         model = DailyPlan
-        fields = ['id', 'merchandiser', 'plan_date', 'notes', 'stores']
-        read_only_fields = ['id']
+        fields = ('id', 'merchandiser', 'plan_date', 'notes', 'stores')
+        read_only_fields = ('id',)
 
     def create(self, validated_data):
         """
@@ -109,34 +150,30 @@ class DailyPlanCreateSerializer(serializers.ModelSerializer):
         :param daily_plan: The DailyPlan instance to associate visits with.
         :param stores_data: List of dictionaries containing store visit data.
         """
+        # Validate uniqueness of visit_order and store in data BEFORE creation
+        _validate_unique_visits(stores_data)
 
-        # Validate uniqueness of visit_order and store in data BEFORE creation loop
-        visit_orders_in_data = [item.get('visit_order') for item in stores_data if item.get('visit_order') is not None]
-        store_ids_in_data = [item.get('store').id if isinstance(item.get('store'), Store) else item.get('store') for
-                             item in stores_data if item.get('store') is not None]
-
-        if len(store_ids_in_data) != len(set(store_ids_in_data)):
-            raise serializers.ValidationError({"stores": "Duplicate store found in the provided list for this plan."})
-        if len(visit_orders_in_data) != len(set(visit_orders_in_data)):
-            raise serializers.ValidationError(
-                {"stores": "Duplicate visit order found in the provided list for this plan."})
-
-        for store_data in stores_data:
-            store = store_data.pop('store')
-            DailyPlanStore.objects.create(daily_plan=daily_plan, store=store, **store_data)
+        # Insert all visits with a single multi-row INSERT
+        DailyPlanStore.objects.bulk_create(
+            [DailyPlanStore(daily_plan=daily_plan, **store_data) for store_data in stores_data],
+            batch_size=1000
+        )
 
 
-class DailyPlanUpdateSerializer(serializers.ModelSerializer):
+class DailyPlanUpdateSerializer(PrefetchRelatedMixin, serializers.ModelSerializer):
     """
     Serializer for updating existing DailyPlan instances.
     Allows updating plan details and associated store visits.
     """
     stores = DailyPlanStoreSerializer(many=True, required=False)
+    prefetch_related_ids = {'_store_cache': ('stores', 'store', Store)}
+    # Visit fields compared when deciding whether an existing visit needs to be written
+    VISIT_FIELDS = ('visit_order', 'visited_at', 'completed')
 
     class Meta:
         model = DailyPlan
-        fields = ['id', 'plan_date', 'notes', 'stores']
-        read_only_fields = ['id']
+        fields = ('id', 'plan_date', 'notes', 'stores')
+        read_only_fields = ('id',)
 
     def update(self, instance, validated_data):
         """
@@ -152,30 +189,53 @@ class DailyPlanUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
 
-        # Completely replace DailyPlanStore objects by deleting old and creating new
         if stores_data is not None:
-            # Validate uniqueness of visit_order and store in data BEFORE creation loop
-            visit_orders_in_data = []
-            store_ids_in_data = []
-            for item in stores_data:
-                if item.get('visit_order') is not None:
-                    visit_orders_in_data.append(item['visit_order'])
-                if item.get('store') is not None:
-                    store_ids_in_data.append(item['store'].id if isinstance(item['store'], Store) else item['store'])
-
-            if len(store_ids_in_data) != len(set(store_ids_in_data)):
-                raise serializers.ValidationError(
-                    {"stores": "Duplicate store found in the provided list for this plan."})
-            if len(visit_orders_in_data) != len(set(visit_orders_in_data)):
-                raise serializers.ValidationError(
-                    {"stores": "Duplicate visit order found in the provided list for this plan."})
+            # Validate uniqueness of visit_order and store in data BEFORE writing anything
+            _validate_unique_visits(stores_data)
 
-            with transaction.atomic():  # Ensure atomicity of delete and create
-                # 1. Delete all existing DailyPlanStore objects for this plan
-                instance.stores.all().delete()
-                # 2. Create new DailyPlanStore objects based on the provided data
-                for visit_data in stores_data:
-                    store_instance = visit_data.pop('store')  # This will be a Store instance
-                    DailyPlanStore.objects.create(daily_plan=instance, store=store_instance, **visit_data)
+            with transaction.atomic():  # Ensure atomicity of the visit changes
+                self._update_daily_plan_stores(instance, stores_data)
 
         return instance
+
+    def _update_daily_plan_stores(self, daily_plan, stores_data):
+        """
+        Helper method to bring the plan's visits in line with the provided list.
+        Visits are matched by store: stores no longer listed are deleted, new stores are created and
+        matched visits are updated only if one of their fields changed. Each kind of change is a single
+        batched query, so an unchanged list of visits costs no writes at all.
+        :param daily_plan: The DailyPlan instance whose visits are updated.
+        :param stores_data: List of dictionaries containing store visit data.
+        """
+        # Served from the prefetch cache when the plan was loaded with DailyPlanSerializer.setup_eager_loading()
+        existing_by_store_id = {visit.store_id: visit for visit in daily_plan.stores.all()}
+        incoming_by_store_id = {visit_data['store'].id: visit_data for visit_data in stores_data}
+
+        # Fields left out of a visit are reset to their model defaults, as the visit list is a full replacement
+        defaults = {name: DailyPlanStore._meta.get_field(name).get_default() for name in self.VISIT_FIELDS}
+        now = timezone.now()
+        to_update = []
+        for store_id in existing_by_store_id.keys() & incoming_by_store_id.keys():
+            visit = existing_by_store_id[store_id]
+            visit_data = incoming_by_store_id[store_id]
+            changed = False
+            for name in self.VISIT_FIELDS:
+                value = visit_data.get(name, defaults[name])
+                if getattr(visit, name) != value:
+                    setattr(visit, name, value)
+                    changed = True
+            if changed:
+                visit.updated_at = now  # bulk_update() does not apply auto_now
+                to_update.append(visit)
+
+        to_delete = existing_by_store_id.keys() - incoming_by_store_id.keys()
+        if to_delete:
+            DailyPlanStore.objects.filter(daily_plan=daily_plan, store_id__in=to_delete).delete()
+        if to_update:
+            DailyPlanStore.objects.bulk_update(to_update, fields=[*self.VISIT_FIELDS, 'updated_at'],
+                                               batch_size=1000)
+        # Iterating the request data keeps new visits in the order they were submitted
+        to_create = [DailyPlanStore(daily_plan=daily_plan, **visit_data) for visit_data in stores_data
+                     if visit_data['store'].id not in existing_by_store_id]
+        if to_create:
+            DailyPlanStore.objects.bulk_create(to_create, batch_size=1000)
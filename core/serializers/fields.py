@@ -0,0 +1,100 @@
+from rest_framework import serializers
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key related field that resolves IDs from a {pk: instance} map preloaded into the serializer
+    context under `cache_key` (see PrefetchRelatedMixin), instead of running one query per value.
+    Falls back to the regular per-value lookup when no map is available.
+    """
+
+    def __init__(self, cache_key=None, **kwargs):
+        self.cache_key = cache_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        """
+        Returns the preloaded instance for the given primary key.
+        :param data: The raw primary key value.
+        :return: The related model instance.
+        :raises serializers.ValidationError: If the value is not a valid ID or the object does not exist.
+        """
+        related_objects = self.context.get(self.cache_key) if self.cache_key else None
+        if related_objects is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        instance = related_objects.get(pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+
+class PrefetchRelatedMixin:
+    """
+    Serializer mixin that loads all objects referenced by a nested list with a single in_bulk() query
+    before validation, and stores them in the context for CachedPrimaryKeyRelatedField.
+    Subclasses declare `prefetch_related_ids = {cache_key: (list_field, item_key, source)}`, where source is
+    a model, a queryset (e.g. with only(...) to limit the loaded columns) or a function taking a set of IDs
+    and returning a {pk: instance} dictionary.
+    """
+    prefetch_related_ids = {}
+
+    def to_internal_value(self, data):
+        """
+        Preloads the referenced objects, then runs the regular validation.
+        :param data: The raw request data.
+        :return: The validated data.
+        """
+        context = self.context
+        for cache_key, (list_field, item_key, source) in self.prefetch_related_ids.items():
+            items = data.get(list_field) if hasattr(data, 'get') else None
+            if not isinstance(items, list):
+                continue
+            ids = set()
+            for item in items:
+                if not isinstance(item, dict) or isinstance(item.get(item_key), bool):
+                    continue
+                try:
+                    ids.add(int(item.get(item_key)))
+                except (TypeError, ValueError):
+                    continue  # Left for the field to report as an invalid value
+            if isinstance(source, type):
+                context[cache_key] = source._default_manager.in_bulk(ids)
+            elif hasattr(source, 'in_bulk'):
+                context[cache_key] = source.all().in_bulk(ids)
+            else:
+                context[cache_key] = source(ids)
+        return super().to_internal_value(data)
+
+
+class PartialRepresentationMixin:
+    """
+    Serializer mixin that renders only some fields of an instance, e.g. the fields a partial update is about
+    to change, for the "before" snapshot of an audit log entry.
+    Each field is rendered exactly as in the full representation; the other fields (and their related objects)
+    are not touched.
+    """
+
+    def to_partial_representation(self, instance, field_names):
+        """
+        Returns the representation of the given fields of an instance.
+        :param instance: The model instance to render.
+        :param field_names: Names of the fields to include; names this serializer does not render are ignored.
+        :return: Dictionary of field name to its representation.
+        """
+        fields = self.fields
+        data = {}
+        for name in field_names:
+            field = fields.get(name)
+            if field is None or field.write_only:
+                continue
+            value = field.get_attribute(instance)
+            data[name] = None if value is None else field.to_representation(value)
+        return data
@@ -12,5 +12,19 @@ class LogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Log
-        fields = ['id', 'user', 'username', 'action', 'details', 'timestamp']
-        read_only_fields = ['id', 'user', 'username', 'action', 'details', 'timestamp']
+        fields = ('id', 'user', 'username', 'action', 'details', 'timestamp')
+        read_only_fields = ('id', 'user', 'username', 'action', 'details', 'timestamp')
+
+
+class LogListSerializer(serializers.Serializer):
+    """
+    Lightweight read-only serializer for log listings.
+    Works on plain rows from Log.objects.values(...), so no model field introspection or per-row
+    attribute lookups are needed. Produces the same representation as LogSerializer.
+    """
+    id = serializers.IntegerField(read_only=True)
+    user = serializers.IntegerField(read_only=True, allow_null=True)
+    username = serializers.CharField(read_only=True, allow_null=True)
+    action = serializers.CharField(read_only=True)
+    details = serializers.JSONField(read_only=True)
+    timestamp = serializers.DateTimeField(read_only=True)
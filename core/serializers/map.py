@@ -10,5 +10,5 @@ class StoreMapSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Store
-        fields = ['id', 'name', 'address', 'latitude', 'longitude']
-        read_only_fields = ['id', 'name', 'address', 'latitude', 'longitude']
+        fields = ('id', 'name', 'address', 'latitude', 'longitude')
+        read_only_fields = ('id', 'name', 'address', 'latitude', 'longitude')
@@ -12,10 +12,11 @@ class StoreMetricsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = StoreMetrics
-        fields = '__all__'  # Includes all fields for display
-        read_only_fields = ['id', 'store', 'store_name', 'date',
+        fields = ('id', 'store', 'store_name', 'date', 'total_orders_count', 'total_quantity_ordered',
+                  'average_order_amount', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'store', 'store_name', 'date',
                             'total_orders_count', 'total_quantity_ordered',
-                            'average_order_amount', 'created_at', 'updated_at']
+                            'average_order_amount', 'created_at', 'updated_at')
 
 
 class CalculatedStoreMetricsSerializer(serializers.Serializer):
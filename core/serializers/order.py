@@ -1,6 +1,10 @@
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework import serializers
 
 from core.models import Order, OrderItem, Product
+from core.serializers.fields import CachedPrimaryKeyRelatedField, PartialRepresentationMixin, PrefetchRelatedMixin
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -8,27 +12,17 @@ class OrderItemSerializer(serializers.ModelSerializer):
     Serializer for OrderItem.
     Used to manage individual products within an order.
     """
+    # Resolved from the products preloaded by the parent serializer, so validating an order costs one query
+    product = CachedPrimaryKeyRelatedField(
+        queryset=Product.objects.all(), cache_key='_product_cache',
+        error_messages={'does_not_exist': 'Product with ID {pk_value} does not exist.'}
+    )
     product_name = serializers.CharField(source='product.name', read_only=True)
 
     class Meta:
         model = OrderItem
-        fields = ['id', 'product', 'product_name', 'quantity', 'price_per_unit']
-        read_only_fields = ['id', 'product_name']
-
-    def validate_product(self, product_id):
-        """
-        Validates that the product exists.
-        :param product_id: The ID of the product.
-        :return: The Product instance.
-        :raises serializers.ValidationError: If product does not exist.
-        """
-        try:
-            # Ensure product_id is an actual ID, not an object
-            if isinstance(product_id, Product):
-                product_id = product_id.id
-            return Product.objects.get(id=product_id)
-        except Product.DoesNotExist:
-            raise serializers.ValidationError(f"Product with ID {product_id} does not exist.")
+        fields = ('id', 'product', 'product_name', 'quantity', 'price_per_unit')
+        read_only_fields = ('id', 'product_name')
 
     def validate(self, data):
         """
@@ -43,7 +37,15 @@ class OrderItemSerializer(serializers.ModelSerializer):
         return data
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderItemUpdateSerializer(OrderItemSerializer):
+    """
+    Serializer for OrderItem within an order update.
+    Accepts an optional 'id' so existing items can be matched and updated in place.
+    """
+    id = serializers.IntegerField(required=False)
+
+
+class OrderSerializer(PartialRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer for Order.
     Used for displaying order details, including nested order items.
@@ -54,23 +56,39 @@ class OrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ['id', 'store', 'store_name', 'merchandiser', 'merchandiser_username',
-                  'order_date', 'status', 'total_amount', 'items', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'merchandiser', 'merchandiser_username', 'total_amount', 'items',
-                            'created_at', 'updated_at']
+        fields = ('id', 'store', 'store_name', 'merchandiser', 'merchandiser_username',
+                  'order_date', 'status', 'total_amount', 'items', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'merchandiser', 'merchandiser_username', 'total_amount', 'items',
+                            'created_at', 'updated_at')
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Joins the store and merchandiser (for their rendered names) and prefetches the order items together with
+        their products, so rendering the orders costs one extra query in total instead of several per order.
+        Only the rendered item columns and the product name are loaded (not e.g. the product description).
+        :param queryset: An Order queryset.
+        :return: The queryset with the store and merchandiser joined and the items and their products prefetched.
+        """
+        items = OrderItem.objects.select_related('product').only(
+            'id', 'order_id', 'product_id', 'quantity', 'price_per_unit', 'product__name'
+        )
+        return queryset.select_related('store', 'merchandiser').prefetch_related(Prefetch('items', queryset=items))
 
 
-class OrderCreateSerializer(serializers.ModelSerializer):
+class OrderCreateSerializer(PrefetchRelatedMixin, serializers.ModelSerializer):
     """
     Serializer for creating new orders.
     Allows specifying order items within the same request.
     """
     items = OrderItemSerializer(many=True)  # Nested serializer for order items
+    # Loads every product referenced in 'items' with a single query before validation
+    prefetch_related_ids = {'_product_cache': ('items', 'product', Product)}
 
     class Meta:
         model = Order
-        fields = ['id', 'store', 'order_date', 'status', 'items']
-        read_only_fields = ['id']
+        fields = ('id', 'store', 'order_date', 'status', 'items')
+        read_only_fields = ('id',)
 
     def create(self, validated_data):
         """
@@ -85,34 +103,26 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Authenticated user (merchandiser) is required for order creation.")
         merchandiser_instance = request.user
 
-        order = Order.objects.create(merchandiser=merchandiser_instance, **validated_data)
-
-        self._create_order_items(order, items_data)
-        order.calculate_total_amount()
+        with transaction.atomic():  # Ensure atomicity for Order creation and nested items
+            order = Order.objects.create(merchandiser=merchandiser_instance, **validated_data)
+            # Inserts all items in one statement and recalculates the total once
+            OrderItem.bulk_add(order, items_data)
         return order
 
-    def _create_order_items(self, order, items_data):
-        """
-        Helper method to create OrderItems for a given Order.
-        :param order: The Order instance to associate items with.
-        :param items_data: List of dictionaries containing order item data.
-        """
-        for item_data in items_data:
-            product = item_data.pop('product')  # product will be an instance validated by OrderItemSerializer
-            OrderItem.objects.create(order=order, product=product, **item_data)
-
 
-class OrderUpdateSerializer(serializers.ModelSerializer):
+class OrderUpdateSerializer(PrefetchRelatedMixin, serializers.ModelSerializer):
     """
     Serializer for updating existing orders.
     Allows updating order items; existing items can be updated, new items added, and items can be removed.
     """
-    items = OrderItemSerializer(many=True, required=False)  # Nested serializer for order items, optional for update
+    # Nested serializer for order items, optional for update
+    items = OrderItemUpdateSerializer(many=True, required=False)
+    prefetch_related_ids = {'_product_cache': ('items', 'product', Product)}
 
     class Meta:
         model = Order
-        fields = ['id', 'store', 'order_date', 'status', 'items']
-        read_only_fields = ['id']  # ID is read-only, store is usually not changed after creation
+        fields = ('id', 'store', 'order_date', 'status', 'items')
+        read_only_fields = ('id',)  # ID is read-only, store is usually not changed after creation
 
     def update(self, instance, validated_data):
         """
@@ -129,8 +139,10 @@ class OrderUpdateSerializer(serializers.ModelSerializer):
         instance.save()
 
         if items_data is not None:
-            self._update_order_items(instance, items_data)
-            instance.calculate_total_amount()
+            with transaction.atomic():  # Ensure atomicity of item changes and the total recalculation
+                items = self._update_order_items(instance, items_data)
+                # The full item list is in memory, so the total is written without reading the order back
+                instance.calculate_total_amount(items=items)
         return instance
 
     def _update_order_items(self, order, items_data):
@@ -139,31 +151,35 @@ class OrderUpdateSerializer(serializers.ModelSerializer):
         This method handles creating new items, updating existing ones, and deleting removed ones.
         :param order: The Order instance to update items for.
         :param items_data: List of dictionaries containing order item data.
+        :return: List of the order's items after the update.
         """
-        # Keep track of item IDs from the request
-        requested_item_ids = set()
+        # Fetch the current items once instead of one query per requested item
+        existing_items = {item.id: item for item in order.items.all()}
+        items_to_update = {}
+        items_to_create = []
+        now = timezone.now()
         for item_data in items_data:
-            item_id = item_data.get('id')
-            product = item_data.pop('product')  # product will be an instance validated by OrderItemSerializer
-
-            if item_id:
-                # Update existing item
-                try:
-                    order_item_instance = OrderItem.objects.get(id=item_id, order=order)
-                    for attr, value in item_data.items():
-                        setattr(order_item_instance, attr, value)
-                    order_item_instance.product = product  # Update product in case it changed (less common)
-                    order_item_instance.save()
-                    requested_item_ids.add(item_id)
-                except OrderItem.DoesNotExist:
-                    # If ID provided but not found, create as new (or raise error)
-                    # For simplicity, we create a new one. A more robust solution might raise an error.
-                    OrderItem.objects.create(order=order, product=product, **item_data)
-                    requested_item_ids.add(OrderItem.objects.latest('id').id)  # Add new item's ID
+            item_id = item_data.pop('id', None)
+            order_item_instance = existing_items.get(item_id)
+
+            if order_item_instance is not None:
+                # Update existing item (product is an instance validated by OrderItemSerializer)
+                for attr, value in item_data.items():
+                    setattr(order_item_instance, attr, value)
+                order_item_instance.updated_at = now  # bulk_update() does not apply auto_now
+                items_to_update[item_id] = order_item_instance
             else:
-                # Create new item if no ID provided
-                new_item = OrderItem.objects.create(order=order, product=product, **item_data)
-                requested_item_ids.add(new_item.id)
+                # If no ID is provided, or it does not belong to this order, create a new item
+                items_to_create.append(OrderItem(order=order, **item_data))
 
         # Delete items that are no longer in the request list
-        order.items.exclude(id__in=requested_item_ids).delete()
+        removed_item_ids = existing_items.keys() - items_to_update.keys()
+        if removed_item_ids:
+            OrderItem.objects.filter(id__in=removed_item_ids).delete()
+        if items_to_update:
+            OrderItem.objects.bulk_update(items_to_update.values(),
+                                          fields=['product', 'quantity', 'price_per_unit', 'updated_at'],
+                                          batch_size=500)
+        if items_to_create:
+            OrderItem.objects.bulk_create(items_to_create, batch_size=500)
+        return [*items_to_update.values(), *items_to_create]
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from core.models import Product
+from core.serializers.fields import PartialRepresentationMixin
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(PartialRepresentationMixin, serializers.ModelSerializer):
     """
     General purpose serializer for Product model.
     Used for displaying product information (read-only contexts).
@@ -10,8 +11,8 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ('id', 'name', 'description', 'price', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_at', 'updated_at')
 
 
 class ProductCreateSerializer(serializers.ModelSerializer):
@@ -21,8 +22,8 @@ class ProductCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = ['id', 'name', 'description', 'price']
-        read_only_fields = ['id']
+        fields = ('id', 'name', 'description', 'price')
+        read_only_fields = ('id',)
 
 
 class ProductUpdateSerializer(serializers.ModelSerializer):
@@ -33,7 +34,7 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = ['name', 'description', 'price']  # Fields that can be updated
+        fields = ('name', 'description', 'price')  # Fields that can be updated
         extra_kwargs = {
             'name': {'required': False},
             'description': {'required': False},
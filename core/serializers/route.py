@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from core.models import Store
+from core.cache import get_route_stores
+from core.serializers.fields import PrefetchRelatedMixin
 
 
 class RoutePointSerializer(serializers.Serializer):
@@ -23,14 +24,18 @@ class RoutePointSerializer(serializers.Serializer):
         if not isinstance(store_id, int):
             raise serializers.ValidationError("Store ID must be an integer.")
 
-        try:
-            store = Store.objects.get(id=store_id)
-            if store.latitude is None or store.longitude is None:
-                raise serializers.ValidationError(
-                    f"Store with ID {store_id} must have defined latitude and longitude for routing.")
-            return store  # Return the Store instance as the internal value
-        except Store.DoesNotExist:
+        # Stores preloaded by RouteRequestSerializer in one batch; fall back to a lookup when used standalone
+        stores_by_id = self.context.get('_route_store_cache')
+        if stores_by_id is None:
+            stores_by_id = get_route_stores([store_id])
+        store = stores_by_id.get(store_id)
+
+        if store is None:
             raise serializers.ValidationError(f"Store with ID {store_id} does not exist.")
+        if store.latitude is None or store.longitude is None:
+            raise serializers.ValidationError(
+                f"Store with ID {store_id} must have defined latitude and longitude for routing.")
+        return store  # Return the Store instance as the internal value
 
     def to_representation(self, instance):
         """
@@ -41,12 +46,14 @@ class RoutePointSerializer(serializers.Serializer):
         return {'store_id': instance.id}  # Only return ID for request input
 
 
-class RouteRequestSerializer(serializers.Serializer):
+class RouteRequestSerializer(PrefetchRelatedMixin, serializers.Serializer):
     """
     Serializer for the request body to calculate a route.
     Includes a list of store IDs for the route and an optional optimize_order flag.
     """
     points = RoutePointSerializer(many=True, help_text="List of store IDs in desired order.")
+    # Loads every store referenced in 'points' before validation, from the cache or with a single query
+    prefetch_related_ids = {'_route_store_cache': ('points', 'store_id', get_route_stores)}
     optimize_order = serializers.BooleanField(default=False, help_text="Attempt to optimize the order of visits.")
 
     def validate_points(self, value):
@@ -68,12 +75,32 @@ class RouteResponseSegmentSerializer(serializers.Serializer):
     store_id = serializers.IntegerField()
     store_name = serializers.CharField()
     store_address = serializers.CharField()
-    latitude = serializers.DecimalField(max_digits=9, decimal_places=6)
-    longitude = serializers.DecimalField(max_digits=9, decimal_places=6)
-    distance_to_next_km = serializers.DecimalField(max_digits=10, decimal_places=2,
-                                                   help_text="Distance to next point in kilometers.", required=False)
-    duration_to_next_min = serializers.DecimalField(max_digits=10, decimal_places=2,
-                                                    help_text="Duration to next point in minutes.", required=False)
+    # Output-only values, returned as JSON numbers: coordinates as stored (6-digit precision),
+    # distance and duration rounded to 2 decimals by the route view
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    distance_to_next_km = serializers.FloatField(help_text="Distance to next point in kilometers.", required=False)
+    duration_to_next_min = serializers.FloatField(help_text="Duration to next point in minutes.", required=False)
+
+    def to_representation(self, instance):
+        """
+        Builds a route segment directly from the point dictionary built by the route view,
+        skipping the per-field dispatch. The output matches the declared fields.
+        :param instance: Dictionary with the store fields and optional distance/duration to the next point.
+        :return: Dictionary representation of the segment.
+        """
+        data = {
+            'store_id': instance['store_id'],
+            'store_name': instance['store_name'],
+            'store_address': instance['store_address'],
+            'latitude': float(instance['latitude']),
+            'longitude': float(instance['longitude']),
+        }
+        for key in ('distance_to_next_km', 'duration_to_next_min'):
+            if key in instance:
+                value = instance[key]
+                data[key] = None if value is None else float(value)
+        return data
 
 
 class RouteResponseSerializer(serializers.Serializer):
@@ -81,10 +108,8 @@ class RouteResponseSerializer(serializers.Serializer):
     Serializer for the overall route calculation response.
     Includes total distance, duration, and ordered list of visited points.
     """
-    total_distance_km = serializers.DecimalField(max_digits=10, decimal_places=2,
-                                                 help_text="Total route distance in kilometers.")
-    total_duration_min = serializers.DecimalField(max_digits=10, decimal_places=2,
-                                                  help_text="Total route duration in minutes.")
+    total_distance_km = serializers.FloatField(help_text="Total route distance in kilometers.")
+    total_duration_min = serializers.FloatField(help_text="Total route duration in minutes.")
     ordered_points = RouteResponseSegmentSerializer(many=True, help_text="Stores in the calculated order.")
     route_geometry = serializers.CharField(help_text="Overview polyline geometry of the route.", required=False)
     optimized = serializers.BooleanField(help_text="Indicates if the order of points was optimized.", default=False)
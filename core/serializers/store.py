@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from core.models import Store
+from core.serializers.fields import PartialRepresentationMixin
 
 
-class StoreSerializer(serializers.ModelSerializer):
+class StoreSerializer(PartialRepresentationMixin, serializers.ModelSerializer):
     """
     General purpose serializer for Store model.
     Used for displaying store information (read-only contexts).
@@ -11,8 +12,22 @@ class StoreSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Store
-        fields = '__all__'  # Include all fields for display
-        read_only_fields = ['id', 'created_at', 'updated_at']  # These fields are read-only
+        # Explicit list so new model columns are opt-in rather than silently added to every response
+        fields = ('id', 'name', 'address', 'latitude', 'longitude', 'contact_person_name', 'contact_person_phone',
+                  'created_at', 'updated_at')
+        # Only used for output (writes go through StoreCreateSerializer/StoreUpdateSerializer), so every field
+        # is read-only and DRF builds no validators for it
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Limits the queryset to the columns this serializer renders.
+        Related objects added to the serializer later should be joined or prefetched here as well.
+        :param queryset: A Store queryset.
+        :return: The queryset loading only the serialized columns.
+        """
+        return queryset.only(*cls.Meta.fields)
 
 
 class StoreCreateSerializer(serializers.ModelSerializer):
@@ -23,8 +38,8 @@ class StoreCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Store
         # Fields required for creating a new store
-        fields = ['id', 'name', 'address', 'latitude', 'longitude', 'contact_person_name', 'contact_person_phone']
-        read_only_fields = ['id']
+        fields = ('id', 'name', 'address', 'latitude', 'longitude', 'contact_person_name', 'contact_person_phone')
+        read_only_fields = ('id',)
 
 
 class StoreUpdateSerializer(serializers.ModelSerializer):
@@ -36,7 +51,7 @@ class StoreUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Store
         # Fields that can be updated. 'id' is read-only implicitly.
-        fields = ['name', 'address', 'latitude', 'longitude', 'contact_person_name', 'contact_person_phone']
+        fields = ('name', 'address', 'latitude', 'longitude', 'contact_person_name', 'contact_person_phone')
         extra_kwargs = {
             'name': {'required': False},
             'address': {'required': False},
@@ -1,7 +1,19 @@
 from django.contrib.auth import authenticate
+from django.db import IntegrityError
+from django.db.models import Q
 from rest_framework import serializers
 
 from core.models import User
+from core.serializers.fields import PartialRepresentationMixin
+
+__all__ = [
+    'UserRegisterSerializer',
+    'UserLoginSerializer',
+    'UserSerializer',
+    'UserListSerializer',
+    'UserCreateSerializer',
+    'UserUpdateSerializer',
+]
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
@@ -14,18 +26,37 @@ class UserRegisterSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = ['username', 'email', 'password', 'password2', 'role', 'first_name', 'last_name']
-        extra_kwargs = {'password': {'write_only': True}}
+        fields = ('username', 'email', 'password', 'password2', 'role', 'first_name', 'last_name')
+        extra_kwargs = {
+            'password': {'write_only': True},
+            # Username uniqueness is checked in validate() together with the email, in one query
+            'username': {'validators': [User.username_validator]},
+        }
 
     def validate(self, data):
         """
-        Validate passwords match and username is unique.
+        Validate passwords match and that the username and email are not taken yet.
+        Both are checked with a single query.
         :param data: The validated data from the request.
         :return: The validated data.
-        :raises serializers.ValidationError: If passwords do not match.
+        :raises serializers.ValidationError: If passwords do not match or the username or email is taken.
         """
         if data['password'] != data['password2']:
             raise serializers.ValidationError({"password": "Passwords do not match."})
+
+        username = data['username']
+        email = data.get('email')
+        conflicts = Q(username=username)
+        if email:
+            conflicts |= Q(email__iexact=email)
+        errors = {}
+        for taken_username, taken_email in User.objects.filter(conflicts).values_list('username', 'email')[:2]:
+            if taken_username == username:
+                errors['username'] = "A user with that username already exists."
+            if email and taken_email.lower() == email.lower():
+                errors['email'] = "A user with that email already exists."
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
 
     def create(self, validated_data):
@@ -36,14 +67,18 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         """
         # Remove password2 as it's not a model field
         validated_data.pop('password2')
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data.get('email', ''),  # email is optional for AbstractUser
-            password=validated_data['password'],
-            role=validated_data.get('role', 'merchandiser'),  # Default to merchandiser if not specified
-            first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', '')
-        )
+        try:
+            user = User.objects.create_user(
+                username=validated_data['username'],
+                email=validated_data.get('email', ''),  # email is optional for AbstractUser
+                password=validated_data['password'],
+                role=validated_data.get('role', 'merchandiser'),  # Default to merchandiser if not specified
+                first_name=validated_data.get('first_name', ''),
+                last_name=validated_data.get('last_name', '')
+            )
+        except IntegrityError:
+            # A concurrent registration took the username between validate() and the INSERT
+            raise serializers.ValidationError({"username": "A user with that username already exists."})
         return user
 
 
@@ -73,20 +108,10 @@ class UserLoginSerializer(serializers.Serializer):
         if not password:
             raise serializers.ValidationError("Password is required.")
 
-        user_to_authenticate = None
-        if username:
-            # Try to find user by username (case-sensitive as username is unique)
-            user_to_authenticate = User.objects.filter(username=username).first()
-        elif email:
-            # Try to find user by email (case-insensitive)
-            user_to_authenticate = User.objects.filter(email__iexact=email).first()
-
-        # If a user object was found by username or email, attempt to authenticate it
-        user = None
-        if user_to_authenticate:
-            # Now use Django's authenticate function with the found user's actual username
-            user = authenticate(request=self.context.get('request'), username=user_to_authenticate.username,
-                                password=password)
+        # EmailOrUsernameModelBackend looks the user up by username (case-sensitive) or, when no username
+        # is given, by email (case-insensitive), so the whole login costs a single user query
+        user = authenticate(request=self.context.get('request'), username=username or None,
+                            email=email or None, password=password)
 
         if not user:
             raise serializers.ValidationError("Invalid credentials. Please try again.")
@@ -95,7 +120,7 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(PartialRepresentationMixin, serializers.ModelSerializer):
     """
     General purpose serializer for User model.
     Used to display user information after successful login or registration.
@@ -103,9 +128,30 @@ class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'role', 'first_name', 'last_name', 'date_joined']
-        read_only_fields = ['id', 'username', 'email', 'role',
-                            'date_joined']  # These fields are read-only when displaying user data
+        fields = ('id', 'username', 'email', 'role', 'first_name', 'last_name', 'date_joined')
+        # Only used for output (writes go through the register/create/update serializers), so every field
+        # is read-only and DRF builds no validators for it
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Limits the queryset to the columns this serializer renders.
+        Related objects added to the serializer later should be joined or prefetched here as well.
+        :param queryset: A User queryset.
+        :return: The queryset loading only the serialized columns.
+        """
+        return queryset.only(*cls.Meta.fields)
+
+
+class UserListSerializer(serializers.Serializer):
+    """
+    Lean read-only serializer for user pickers (dropdowns, filters).
+    Works on plain dictionaries from User.objects.values(), so no model instances are built.
+    """
+    id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    role = serializers.CharField(read_only=True)
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -117,8 +163,8 @@ class UserCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'password', 'role', 'first_name', 'last_name']
-        read_only_fields = ['id']
+        fields = ('id', 'username', 'email', 'password', 'role', 'first_name', 'last_name')
+        read_only_fields = ('id',)
 
     def create(self, validated_data):
         """
@@ -143,12 +189,13 @@ class UserUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = ['username', 'email', 'role', 'first_name', 'last_name', 'password', 'date_joined']
+        fields = ('username', 'email', 'role', 'first_name', 'last_name', 'password', 'date_joined')
 
     def update(self, instance, validated_data):
         """
         Update an existing User instance.
         Hashes password if a new one is provided.
+        Only the submitted columns are written, so a partial update does not rewrite the whole row.
         :param instance: The User instance to update.
         :param validated_data: Dictionary of validated data for user update.
         :return: Updated User instance.
@@ -156,9 +203,11 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password', None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
+        update_fields = list(validated_data)
 
         if password:
             instance.set_password(password)
+            update_fields.append('password')
 
-        instance.save()
+        instance.save(update_fields=update_fields)
         return instance
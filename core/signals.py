@@ -1,7 +1,10 @@
-from django.db.models.signals import post_migrate
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
-from .models import User
+from .cache import invalidate_route_stores, invalidate_store_metrics
+from .hashers import hash_password
+from .models import Store, StoreMetrics, User
 
 
 @receiver(post_migrate)
@@ -9,16 +12,53 @@ def create_initial_users(sender, **kwargs):
     """
     Signal handler to create initial users (admin and regular user)
     after database migrations are applied.
-    This runs only if the current process is not a "reloader" (e.g., during runserver restarts).
+    post_migrate is sent once per installed app, so only the core app's signal is handled.
+    Missing users are found with one query and inserted together; existing users are left untouched.
     """
+    if sender.label != 'core':
+        return
 
     print("Checking for initial users...")
-    # Create 'admin' user with manager role
-    if not User.objects.filter(username='admin').exists():
-        User.objects.create_superuser(username='admin', email='admin@example.com', password='admin', role='manager')
-        print("Created initial admin user (username: admin, password: admin).")
-
-    # Create 'user' with merchandiser role
-    if not User.objects.filter(username='user').exists():
-        User.objects.create_user(username='user', email='user@example.com', password='user', role='merchandiser')
-        print("Created initial merchandiser user (username: user, password: user).")
+    initial_users = {
+        # Superuser with the manager role
+        'admin': dict(label='admin', email='admin@example.com', password='admin', role='manager',
+                      is_staff=True, is_superuser=True),
+        # Regular user with the merchandiser role
+        'user': dict(label='merchandiser', email='user@example.com', password='user', role='merchandiser'),
+    }
+    using = kwargs.get('using', DEFAULT_DB_ALIAS)
+    existing = set(User.objects.using(using).filter(username__in=initial_users).values_list('username', flat=True))
+    missing = [username for username in initial_users if username not in existing]
+    if not missing:
+        return
+
+    new_users = []
+    for username in missing:
+        fields = dict(initial_users[username])
+        fields.pop('label')
+        password = fields.pop('password')
+        new_users.append(User(username=username, password=hash_password(password), **fields))
+    User.objects.using(using).bulk_create(new_users)
+    for username in missing:
+        print(f"Created initial {initial_users[username]['label']} user "
+              f"(username: {username}, password: {initial_users[username]['password']}).")
+
+
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+def invalidate_route_store_cache(sender, instance, **kwargs):
+    """
+    Signal handler to drop the cached routing data (name, address, coordinates) of a saved or deleted store.
+    """
+    invalidate_route_stores([instance.pk])
+
+
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+@receiver(post_save, sender=StoreMetrics)
+@receiver(post_delete, sender=StoreMetrics)
+def invalidate_store_metrics_cache(sender, instance, **kwargs):
+    """
+    Signal handler to drop the cached store metrics lists after metrics or a store (its name is listed) change.
+    """
+    invalidate_store_metrics()
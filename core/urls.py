@@ -1,6 +1,41 @@
 from django.urls import path
 
-from core.views import *
+from core.views.daily_plan import (
+    DailyPlanCreateView,
+    DailyPlanDeleteView,
+    DailyPlanDetailView,
+    DailyPlanListView,
+    DailyPlanUpdateView,
+)
+from core.views.log import LogDetailView, LogListView
+from core.views.map import DailyPlanStoresListView, MapDataListView
+from core.views.metrics import (
+    CalculateStoreMetricsAPIView,
+    SaveStoreMetricsAPIView,
+    StoreMetricsDetailView,
+    StoreMetricsListView,
+)
+from core.views.order import OrderCreateView, OrderDeleteView, OrderDetailView, OrderListView, OrderUpdateView
+from core.views.product import (
+    ProductCreateView,
+    ProductDeleteView,
+    ProductDetailView,
+    ProductListView,
+    ProductUpdateView,
+)
+from core.views.route import CalculateRouteAPIView
+from core.views.store import StoreCreateView, StoreDeleteView, StoreDetailView, StoreListView, StoreUpdateView
+from core.views.user import (
+    UserChoicesListView,
+    UserCreateView,
+    UserDeleteView,
+    UserDetailView,
+    UserListView,
+    UserLoginAPIView,
+    UserLogoutAPIView,
+    UserRegisterAPIView,
+    UserUpdateView,
+)
 
 app_name = 'core'
 
@@ -12,6 +47,7 @@ urlpatterns = [
 
     # User Management Endpoints (accessible only by managers)
     path('users/', UserListView.as_view(), name='user-list'),  # GET for list
+    path('users/choices/', UserChoicesListView.as_view(), name='user-choices'),  # GET lightweight list for dropdowns
     path('users/create/', UserCreateView.as_view(), name='user-create'),  # POST for create
     path('users/<int:pk>/', UserDetailView.as_view(), name='user-detail'),  # GET for specific user
     path('users/<int:pk>/update/', UserUpdateView.as_view(), name='user-update'),  # PATCH for update
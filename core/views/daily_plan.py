@@ -1,17 +1,18 @@
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import (
     ListModelMixin,
     CreateModelMixin,
     RetrieveModelMixin,
-    UpdateModelMixin,
     DestroyModelMixin
 )
 from rest_framework.permissions import IsAuthenticated
 
-from core.models import Log
+from core.audit import log_action
 from core.permissions import IsManager
 from core.serializers.daily_plan import *
+from core.views.mixins import EagerLoadingMixin, LoggedUpdateMixin
 
 
 class DailyPlanListView(ListModelMixin, GenericAPIView):
@@ -30,9 +31,10 @@ class DailyPlanListView(ListModelMixin, GenericAPIView):
         """
         user = self.request.user
         if user.role == 'manager':
-            return DailyPlan.objects.all().order_by('-plan_date')
+            queryset = DailyPlan.objects.all().order_by('-plan_date')
         else:
-            return DailyPlan.objects.filter(merchandiser=user).order_by('-plan_date')
+            queryset = DailyPlan.objects.filter(merchandiser=user).order_by('-plan_date')
+        return DailyPlanSerializer.setup_eager_loading(queryset)
 
     def get(self, request, *args, **kwargs):
         """
@@ -64,12 +66,12 @@ class DailyPlanCreateView(CreateModelMixin, GenericAPIView):
         response = self.create(request, *args, **kwargs)
 
         if response.status_code == status.HTTP_201_CREATED:
-            created_daily_plan_instance = DailyPlan.objects.get(id=response.data['id'])
-            Log.objects.create(user=self.request.user, action='daily_plan_created',
-                               details={'plan_id': created_daily_plan_instance.id,
-                                        'plan_date': str(created_daily_plan_instance.plan_date),
-                                        'merchandiser': created_daily_plan_instance.merchandiser.username,
-                                        'created_by': self.request.user.username})
+            created_daily_plan_instance = DailyPlan.objects.select_related('merchandiser').get(id=response.data['id'])
+            log_action(user=self.request.user, action='daily_plan_created',
+                       details={'plan_id': created_daily_plan_instance.id,
+                                'plan_date': str(created_daily_plan_instance.plan_date),
+                                'merchandiser': created_daily_plan_instance.merchandiser.username,
+                                'created_by': self.request.user.username})
         return response
 
 
@@ -90,9 +92,10 @@ class DailyPlanDetailView(RetrieveModelMixin, GenericAPIView):
         """
         user = self.request.user
         if user.role == 'manager':
-            return DailyPlan.objects.all()
+            queryset = DailyPlan.objects.all()
         else:
-            return DailyPlan.objects.filter(merchandiser=user)
+            queryset = DailyPlan.objects.filter(merchandiser=user)
+        return DailyPlanSerializer.setup_eager_loading(queryset)
 
     def get(self, request, *args, **kwargs):
         """
@@ -103,7 +106,7 @@ class DailyPlanDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class DailyPlanUpdateView(UpdateModelMixin, GenericAPIView):
+class DailyPlanUpdateView(EagerLoadingMixin, LoggedUpdateMixin, GenericAPIView):
     """
     API endpoint for updating a single daily plan's details.
     Accessible only by authenticated managers.
@@ -111,27 +114,33 @@ class DailyPlanUpdateView(UpdateModelMixin, GenericAPIView):
     """
     queryset = DailyPlan.objects.all()
     serializer_class = DailyPlanUpdateSerializer
+    eager_loading_serializer = DailyPlanSerializer  # Loads the merchandiser and visits of the logged snapshot
+    snapshot_serializer = DailyPlanSerializer
+    update_log_action = 'daily_plan_updated'
     permission_classes = [IsAuthenticated, IsManager]
     lookup_field = 'pk'
 
-    def patch(self, request, *args, **kwargs):
-        """
-        Handles PATCH requests to partially update a daily plan.
-        Logs the update action.
-        :param request: The HTTP request object containing partial plan data.
-        :return: Response with the updated daily plan data.
-        """
-        plan_before_update = DailyPlanSerializer(self.get_object()).data
-        response = self.partial_update(request, *args, **kwargs)
-        if response.status_code == status.HTTP_200_OK:
-            updated_plan_instance = self.get_object()
-            Log.objects.create(user=self.request.user, action='daily_plan_updated',
-                               details={'plan_id': updated_plan_instance.id,
-                                        'plan_date': str(updated_plan_instance.plan_date),
-                                        'merchandiser': updated_plan_instance.merchandiser.username,
-                                        'updated_by': self.request.user.username,
-                                        'old_data': plan_before_update})
-        return response
+    def refresh_prefetched(self, instance, validated_data):
+        """
+        Reloads the store visits, with their stores, in one query when the update replaced them.
+        :param instance: The updated daily plan.
+        :param validated_data: The validated data the plan was updated with.
+        """
+        if 'stores' in validated_data:
+            instance._prefetched_objects_cache = {}
+            prefetch_related_objects(
+                [instance], Prefetch('stores', queryset=DailyPlanStore.objects.select_related('store'))
+            )
+
+    def get_log_details(self, instance):
+        """
+        Returns the daily plan-specific details of the update log entry.
+        :param instance: The updated daily plan.
+        :return: Dictionary of log details.
+        """
+        return {'plan_id': instance.id,
+                'plan_date': str(instance.plan_date),
+                'merchandiser': instance.merchandiser.username}
 
 
 class DailyPlanDeleteView(DestroyModelMixin, GenericAPIView):
@@ -144,6 +153,13 @@ class DailyPlanDeleteView(DestroyModelMixin, GenericAPIView):
     permission_classes = [IsAuthenticated, IsManager]
     lookup_field = 'pk'
 
+    def get_queryset(self):
+        """
+        Joins the merchandiser, whose username is logged with the deletion.
+        :return: Queryset of DailyPlan objects.
+        """
+        return super().get_queryset().select_related('merchandiser')
+
     def delete(self, request, *args, **kwargs):
         """
         Handles DELETE requests to delete a daily plan.
@@ -152,9 +168,9 @@ class DailyPlanDeleteView(DestroyModelMixin, GenericAPIView):
         :return: Response indicating successful deletion.
         """
         instance = self.get_object()
-        Log.objects.create(user=self.request.user, action='daily_plan_deleted',
-                           details={'plan_id': instance.id,
-                                    'plan_date': str(instance.plan_date),
-                                    'merchandiser': instance.merchandiser.username,
-                                    'deleted_by': self.request.user.username})
+        log_action(user=self.request.user, action='daily_plan_deleted',
+                   details={'plan_id': instance.id,
+                            'plan_date': str(instance.plan_date),
+                            'merchandiser': instance.merchandiser.username,
+                            'deleted_by': self.request.user.username})
         return self.destroy(request, *args, **kwargs)
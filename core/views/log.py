@@ -1,19 +1,28 @@
+from django.db.models import F
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.permissions import IsAuthenticated
 
+from core.pagination import LogCursorPagination
 from core.permissions import IsManager
 from core.serializers.log import *
 
 
 class LogListView(ListModelMixin, GenericAPIView):
     """
-    API endpoint for listing all system logs.
+    API endpoint for listing all system logs, newest first.
     Accessible only by authenticated managers.
     Supports filtering by user_id and action type.
+    Paginated with a cursor: the response holds 'next', 'previous' and 'results'.
     """
-    queryset = Log.objects.all().order_by('-timestamp')
-    serializer_class = LogSerializer
+    # Plain rows with the username joined in SQL: the log table is the largest one, so listing it
+    # skips model instantiation and per-row related lookups.
+    # The ordering is the one LogCursorPagination pages by.
+    queryset = Log.objects.order_by('-timestamp', '-id').values(
+        'id', 'user', 'action', 'details', 'timestamp', username=F('user__username')
+    )
+    serializer_class = LogListSerializer
+    pagination_class = LogCursorPagination
     permission_classes = [IsAuthenticated, IsManager]
 
     def get_queryset(self):
@@ -41,7 +50,7 @@ class LogListView(ListModelMixin, GenericAPIView):
         """
         Handles GET requests to list logs.
         :param request: The HTTP request object.
-        :return: Response containing a list of Log objects.
+        :return: Response containing a page of Log objects.
         """
         return self.list(request, *args, **kwargs)
 
@@ -1,18 +1,24 @@
-from django.utils import timezone
+from datetime import date
+
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import ListModelMixin
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from core.serializers import *
 
 
-class MapDataListView(ListModelMixin, GenericAPIView):
+class MapDataListView(GenericAPIView):
     """
     API endpoint for listing store data optimized for map display.
     Accessible by any authenticated user (merchandisers or managers).
     Supports filtering by merchandiser (to see stores in their plans) and plan_date.
     """
-    queryset = Store.objects.filter(latitude__isnull=False, longitude__isnull=False).order_by('name')
+    # Plain rows with only the marker columns: no Store instances are built, and wide text columns
+    # (contact details, timestamps) are not fetched. StoreMapSerializer names the columns and documents the output.
+    queryset = Store.objects.filter(latitude__isnull=False, longitude__isnull=False).order_by('name').values(
+        *StoreMapSerializer.Meta.fields
+    )
     serializer_class = StoreMapSerializer
     permission_classes = [IsAuthenticated]
 
@@ -22,7 +28,7 @@ class MapDataListView(ListModelMixin, GenericAPIView):
         Allows filtering by merchandiser (ID) and plan_date.
         Only managers can filter by any merchandiser ID.
         Merchandisers can only filter by their own ID.
-        :return: Filtered queryset of Store objects.
+        :return: Filtered queryset of store rows (dictionaries).
         """
         queryset = super().get_queryset()
         request_user = self.request.user
@@ -34,30 +40,32 @@ class MapDataListView(ListModelMixin, GenericAPIView):
             if request_user.role == 'merchandiser' and str(request_user.id) != merchandiser_id:
                 return Store.objects.none()
 
-            daily_plan_filters = {'merchandiser__id': merchandiser_id}
+            # Visits of the merchandiser's plans, matched through one join instead of a nested plan subquery
+            visit_filters = {'daily_plan__merchandiser_id': merchandiser_id}
 
             if plan_date_str:
                 try:
-                    plan_date_obj = timezone.datetime.strptime(plan_date_str, '%Y-%m-%d').date()
-                    daily_plan_filters['plan_date__date'] = plan_date_obj
+                    plan_date_obj = date.fromisoformat(plan_date_str)
+                    visit_filters['daily_plan__plan_date'] = plan_date_obj  # plan_date is a DateField
                 except ValueError:
                     return Store.objects.none()
 
+            # IN (subquery) is a semi-join, so each store appears once and no DISTINCT pass is needed
             queryset = queryset.filter(
-                id__in=DailyPlanStore.objects.filter(
-                    daily_plan__in=DailyPlan.objects.filter(**daily_plan_filters)
-                ).values_list('store_id', flat=True)
-            ).distinct()
+                id__in=DailyPlanStore.objects.filter(**visit_filters).values('store_id')
+            )
 
         return queryset
 
     def get(self, request, *args, **kwargs):
         """
         Handles GET requests to list store data for map display.
+        The rows hold only ints, strings and floats, which are already their JSON representation,
+        so they are returned as they are instead of going through StoreMapSerializer field by field.
         :param request: The HTTP request object.
         :return: Response containing a list of store objects.
         """
-        return self.list(request, *args, **kwargs)
+        return Response(list(self.get_queryset()))
 
 
 class DailyPlanStoresListView(ListModelMixin, GenericAPIView):
@@ -79,18 +87,15 @@ class DailyPlanStoresListView(ListModelMixin, GenericAPIView):
         daily_plan_id = self.kwargs.get(self.lookup_field)
         request_user = self.request.user
 
-        try:
-            if request_user.role == 'manager':
-                daily_plan = DailyPlan.objects.get(id=daily_plan_id)
-            else:  # Merchandiser
-                daily_plan = DailyPlan.objects.get(id=daily_plan_id, merchandiser=request_user)
-        except DailyPlan.DoesNotExist:
-            return DailyPlanStore.objects.none()  # Return empty queryset if plan not found or no permission
-
-        # Filter DailyPlanStore objects, not Store objects
-        return daily_plan.stores.filter(
+        # One query: the visits are filtered by plan (and, for merchandisers, by plan owner) directly,
+        # with their stores joined, so an unknown or foreign plan simply yields no rows
+        queryset = DailyPlanStore.objects.filter(
+            daily_plan_id=daily_plan_id,
             store__latitude__isnull=False, store__longitude__isnull=False  # Only include stores with coordinates
-        ).order_by('visit_order').prefetch_related('store')
+        )
+        if request_user.role != 'manager':
+            queryset = queryset.filter(daily_plan__merchandiser=request_user)
+        return queryset.select_related('store').order_by('visit_order')
 
     def get(self, request, *args, **kwargs):
         """
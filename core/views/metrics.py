@@ -1,5 +1,7 @@
-from django.db import transaction
-from django.db.models import Subquery, OuterRef, DecimalField, Sum, Count, Avg
+from datetime import date, datetime, time
+
+from django.core.cache import cache
+from django.db.models import Subquery, OuterRef, DecimalField, Sum, Count, Avg, F, Q
 from django.db.models.functions import Coalesce, Round
 from django.utils import timezone
 from rest_framework import status
@@ -9,7 +11,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import Store, Log, Order, OrderItem
+from core.cache import STORE_METRICS_CACHE_TIMEOUT, store_metrics_list_key
+from core.audit import log_action
+from core.metrics import save_store_metrics
+from core.models import Store, OrderItem
 from core.permissions import IsManager
 from core.serializers.metrics import *
 
@@ -32,15 +37,14 @@ class StoreMetricsListView(ListModelMixin, GenericAPIView):
         queryset = super().get_queryset()
 
         store_name = self.request.query_params.get('store')
-        date = self.request.query_params.get('date')
+        date_str = self.request.query_params.get('date')
 
         if store_name:
-            print(store_name)
             queryset = queryset.filter(store__name__icontains=store_name)
 
-        if date:
+        if date_str:
             try:
-                target_date = timezone.datetime.strptime(date, '%Y-%m-%d').date()
+                target_date = date.fromisoformat(date_str)
                 queryset = queryset.filter(date=target_date)
             except ValueError:
                 return StoreMetrics.objects.none()
@@ -50,10 +54,16 @@ class StoreMetricsListView(ListModelMixin, GenericAPIView):
     def get(self, request, *args, **kwargs):
         """
         Handles GET requests to list all pre-calculated store metrics.
+        The serialized list is cached per set of filters until the metrics or the stores change.
         :param request: The HTTP request object.
         :return: Response containing a list of StoreMetrics objects.
         """
-        return self.list(request, *args, **kwargs)
+        cache_key = store_metrics_list_key(request.query_params)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.list(request, *args, **kwargs).data
+            cache.set(cache_key, data, timeout=STORE_METRICS_CACHE_TIMEOUT)
+        return Response(data)
 
 
 class StoreMetricsDetailView(RetrieveModelMixin, GenericAPIView):
@@ -96,47 +106,31 @@ class CalculateStoreMetricsAPIView(APIView):
 
         if start_date and start_date != '':
             try:
-                start_datetime = timezone.make_aware(
-                    timezone.datetime.strptime(start_date, '%Y-%m-%d')
-                    .replace(
-                        hour=0, minute=0, second=0, microsecond=0
-                    ))
+                start_datetime = timezone.make_aware(datetime.combine(date.fromisoformat(start_date), time.min))
             except ValueError:
                 return Response({"detail": "Invalid start_date format. Use YYYY-MM-DD."},
                                 status=status.HTTP_400_BAD_REQUEST)
         else:
-            start_datetime = timezone.make_aware(
-                timezone.datetime(2025, 6, 1, 0, 0, 0, 0)
-            )
+            start_datetime = timezone.make_aware(datetime(2025, 6, 1, 0, 0, 0, 0))
 
         if end_date and end_date != '':
             try:
-                end_datetime = timezone.make_aware(
-                    timezone.datetime.strptime(end_date, '%Y-%m-%d')
-                    .replace(
-                        hour=23, minute=59, second=59, microsecond=999999
-                    ))
+                # time.max is 23:59:59.999999, so the whole end day is included
+                end_datetime = timezone.make_aware(datetime.combine(date.fromisoformat(end_date), time.max))
             except ValueError:
                 return Response({"detail": "Invalid end_date format. Use YYYY-MM-DD."},
                                 status=status.HTTP_400_BAD_REQUEST)
         else:
             end_datetime = timezone.now()
 
-        orders_in_range = Order.objects.filter(
-            store=OuterRef("pk"), order_date__range=(start_datetime, end_datetime)
-        )
-
-        # Annotate the Store queryset with the required metrics using Subqueries
-        metrics_data = queryset.annotate(
+        # Order count and average come from one LEFT JOIN + GROUP BY over the store's orders in the period.
+        # The item quantity stays a per-store subquery: joining the items into the same GROUP BY would repeat
+        # each order once per item and skew the count and average.
+        orders_in_range = Q(orders__order_date__range=(start_datetime, end_datetime))
+        # The store columns are selected under their output names, so the rows need no renaming
+        metrics_data = queryset.values(store_id=F('id'), store_name=F('name')).annotate(
             # Metric 1: Total number of orders for the store
-            total_orders_count=Coalesce(
-                Subquery(
-                    orders_in_range.values("store")
-                    .annotate(count=Count("pk"))
-                    .values("count")
-                ),
-                0,
-            ),
+            total_orders_count=Count('orders', filter=orders_in_range),
 
             # Metric 2: Total quantity of all items sold in the store's orders
             total_quantity_ordered=Coalesce(
@@ -154,33 +148,16 @@ class CalculateStoreMetricsAPIView(APIView):
 
             # Metric 3: Average order amount for the store
             average_order_amount=Coalesce(
-                Subquery(
-                    orders_in_range.values("store")
-                    .annotate(avg=Round(Avg("total_amount"), 2))
-                    .values("avg")
-                ),
+                Round(Avg('orders__total_amount', filter=orders_in_range), 2),
                 0.0,
                 output_field=DecimalField(),
             ),
-        ).values(
-            'id',
-            'name',
-            'total_orders_count',
-            'total_quantity_ordered',
-            'average_order_amount'
-        ).order_by('name')
+        ).order_by('store_name')
 
-        results = []
-        for item in metrics_data:
-            results.append({
-                'store_id': item['id'],
-                'store_name': item['name'],
-                'total_orders_count': item['total_orders_count'],
-                'total_quantity_ordered': item['total_quantity_ordered'],
-                'average_order_amount': item['average_order_amount'],
-                'start_date': start_datetime.isoformat(),
-                'end_date': end_datetime.isoformat(),
-            })
+        # All arithmetic happens in the database; the rows only need the period attached.
+        # The period bounds are formatted once rather than for every store.
+        period = {'start_date': start_datetime.isoformat(), 'end_date': end_datetime.isoformat()}
+        results = [row | period for row in metrics_data]
 
         serializer = CalculatedStoreMetricsSerializer(results, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -204,77 +181,19 @@ class SaveStoreMetricsAPIView(APIView):
         """
         target_date = request.data.get('target_date')
 
-        queryset = Store.objects.all()
-
         if target_date and target_date != '':
             try:
-                target_datetime = timezone.make_aware(
-                    timezone.datetime.strptime(target_date, '%Y-%m-%d')
-                    .replace(
-                        hour=23, minute=59, second=59, microsecond=999999
-                    ))
-            except ValueError:
-                return Response({"detail": "Invalid end_date format. Use YYYY-MM-DD."},
+                target_day = date.fromisoformat(target_date)
+            except (TypeError, ValueError):
+                return Response({"detail": "Invalid target_date format. Use YYYY-MM-DD."},
                                 status=status.HTTP_400_BAD_REQUEST)
         else:
-            target_datetime = timezone.now()
-
-        order_filters = Order.objects.filter(
-            store=OuterRef("pk"), order_date=target_datetime
-        )
-
-        metrics_data = queryset.annotate(
-            # Metric 1: Total number of orders for the store
-            total_orders_count=Coalesce(
-                Subquery(
-                    order_filters.values("store")
-                    .annotate(count=Count("pk"))
-                    .values("count")
-                ),
-                0,
-            ),
-
-            # Metric 2: Total quantity of all items sold in the store's orders
-            total_quantity_ordered=Coalesce(
-                Subquery(
-                    OrderItem.objects.filter(
-                        order__store=OuterRef("pk"),
-                        order__order_date=target_datetime,
-                    )
-                    .values("order__store")
-                    .annotate(total=Sum("quantity"))
-                    .values("total")
-                ),
-                0,
-            ),
-
-            # Metric 3: Average order amount for the store
-            average_order_amount=Coalesce(
-                Subquery(
-                    order_filters.values("store")
-                    .annotate(avg=Round(Avg("total_amount"), 2))
-                    .values("avg")
-                ),
-                0.0,
-                output_field=DecimalField(),
-            ),
-        ).order_by('name')
+            target_day = timezone.localdate()
+            target_date = target_day.isoformat()
 
-        saved_count = 0
-        with transaction.atomic():
-            for store_obj in metrics_data:
-                StoreMetrics.objects.update_or_create(
-                    store=store_obj,
-                    date=timezone.datetime.strptime(target_date, '%Y-%m-%d').date(),
-                    defaults={
-                        'total_orders_count': store_obj.total_orders_count,
-                        'total_quantity_ordered': store_obj.total_quantity_ordered,
-                        'average_order_amount': store_obj.average_order_amount,
-                    }
-                )
-                saved_count += 1
+        saved_count = save_store_metrics(target_day)
 
-        Log.objects.create(
+        log_action(
             user=request.user,
             action='metrics_saved',
             details={
@@ -0,0 +1,76 @@
+from operator import attrgetter
+
+from rest_framework.mixins import UpdateModelMixin
+from rest_framework.response import Response
+
+from core.audit import log_action
+
+
+class EagerLoadingMixin:
+    """
+    View mixin that applies a serializer's eager loading (joins, prefetches, column limits) to the view's queryset.
+    The serializer declares what it needs in a setup_eager_loading(queryset) classmethod.
+    By default the view's own serializer is used; views that write with one serializer but load rows for
+    another (e.g. an update view whose log snapshot uses the read serializer) set eager_loading_serializer.
+    Must come before GenericAPIView in the bases.
+    """
+    eager_loading_serializer = None
+
+    def get_queryset(self):
+        """
+        Returns the view's queryset with the serializer's eager loading applied.
+        :return: Queryset ready for serialization without per-row queries.
+        """
+        queryset = super().get_queryset()
+        serializer_class = self.eager_loading_serializer or self.get_serializer_class()
+        return serializer_class.setup_eager_loading(queryset)
+
+
+class LoggedUpdateMixin(UpdateModelMixin):
+    """
+    View mixin for PATCH endpoints that record the update in the audit log.
+    The instance is loaded once: the "before" snapshot is taken from it, it is then updated, and the updated
+    instance is logged and returned as is instead of being fetched again.
+    Only the submitted fields are recorded as the old data, rendered as snapshot_serializer (a read serializer
+    with PartialRepresentationMixin) renders them.
+    Views set snapshot_serializer and update_log_action, and name the logged attributes in log_detail_fields
+    (or override get_log_details() for details that need formatting).
+    """
+    snapshot_serializer = None
+    update_log_action = None
+    log_detail_fields = None  # Maps each detail key to an instance attribute path, e.g. {'store_name': 'store.name'}
+
+    def patch(self, request, *args, **kwargs):
+        """
+        Handles PATCH requests to partially update the object and logs the update.
+        :param request: The HTTP request object containing the partial data.
+        :return: Response with the updated object data.
+        """
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        old_data = self.snapshot_serializer().to_partial_representation(instance, serializer.validated_data)
+        self.perform_update(serializer)
+        self.refresh_prefetched(instance, serializer.validated_data)
+        details = self.get_log_details(instance)
+        details.update(updated_by=request.user.username, old_data=old_data)
+        log_action(user=request.user, action=self.update_log_action, details=details)
+        return Response(serializer.data)
+
+    def refresh_prefetched(self, instance, validated_data):
+        """
+        Reloads prefetched relations the update made stale. Does nothing by default.
+        :param instance: The updated instance.
+        :param validated_data: The validated data the instance was updated with.
+        """
+
+    def get_log_details(self, instance):
+        """
+        Returns the view-specific details of the log entry; updated_by and old_data are added by the mixin.
+        By default they are read from the instance as log_detail_fields names them, or hold only its id.
+        :param instance: The updated instance.
+        :return: Dictionary of log details.
+        """
+        if not self.log_detail_fields:
+            return {'id': instance.pk}
+        return {key: attrgetter(path)(instance) for key, path in self.log_detail_fields.items()}
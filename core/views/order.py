@@ -1,24 +1,25 @@
-from rest_framework import status
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import (
     ListModelMixin,
     CreateModelMixin,
     RetrieveModelMixin,
-    UpdateModelMixin,
     DestroyModelMixin
 )
 from rest_framework.permissions import IsAuthenticated
 
-from core.models import Log
+from core.audit import log_action
 from core.permissions import IsManager
 from core.serializers.order import *
+from core.views.mixins import EagerLoadingMixin, LoggedUpdateMixin
 
 
-class OrderListView(ListModelMixin, GenericAPIView):
+class OrderListView(EagerLoadingMixin, ListModelMixin, GenericAPIView):
     """
     API endpoint for listing all orders.
     Managers can see all orders. Merchandisers can only see their own orders.
     """
+    queryset = Order.objects.order_by('-order_date')
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
 
@@ -28,11 +29,11 @@ class OrderListView(ListModelMixin, GenericAPIView):
         Managers see all orders. Merchandisers see only orders they placed.
         :return: Filtered queryset of Order objects.
         """
+        queryset = super().get_queryset()
         user = self.request.user
-        if user.role == 'manager':
-            return Order.objects.all().order_by('-order_date')
-        else:
-            return Order.objects.filter(merchandiser=user).order_by('-order_date')
+        if user.role != 'manager':
+            queryset = queryset.filter(merchandiser=user)
+        return queryset
 
     def get(self, request, *args, **kwargs):
         """
@@ -60,17 +61,21 @@ class OrderCreateView(CreateModelMixin, GenericAPIView):
         :param request: The HTTP request object containing order data.
         :return: Response with the created order data.
         """
+        return self.create(request, *args, **kwargs)
 
-        response = self.create(request, *args, **kwargs)
-        if response.status_code == status.HTTP_201_CREATED:
-            order = Order.objects.get(id=response.data['id'])
-            Log.objects.create(user=self.request.user, action='order_created',
-                               details={'order_id': order.id,
-                                        'store_name': order.store.name,
-                                        'created_by': self.request.user.username})
-            # Ensure calculate_total_amount is called on the created instance
-            order.calculate_total_amount()
-        return response
+    def perform_create(self, serializer):
+        """
+        Saves the new order and logs the creation action.
+        The log uses the instance returned by the serializer, whose store is the instance resolved during
+        validation, so neither the order nor the store is fetched again.
+        The total is already written while the items are created (OrderItem.bulk_add).
+        :param serializer: The validated OrderCreateSerializer.
+        """
+        order = serializer.save()
+        log_action(user=self.request.user, action='order_created',
+                   details={'order_id': order.id,
+                            'store_name': order.store.name,
+                            'created_by': self.request.user.username})
 
     def get_serializer_context(self):
         """
@@ -82,11 +87,12 @@ class OrderCreateView(CreateModelMixin, GenericAPIView):
         return context
 
 
-class OrderDetailView(RetrieveModelMixin, GenericAPIView):
+class OrderDetailView(EagerLoadingMixin, RetrieveModelMixin, GenericAPIView):
     """
     API endpoint for retrieving a single order's details.
     Managers can see any order. Merchandisers can only see their own orders.
     """
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk'
@@ -97,11 +103,11 @@ class OrderDetailView(RetrieveModelMixin, GenericAPIView):
         Managers can view any order. Merchandisers can only view their own orders.
         :return: Filtered queryset of Order objects.
         """
+        queryset = super().get_queryset()
         user = self.request.user
-        if user.role == 'manager':
-            return Order.objects.all()
-        else:
-            return Order.objects.filter(merchandiser=user)
+        if user.role != 'manager':
+            queryset = queryset.filter(merchandiser=user)
+        return queryset
 
     def get(self, request, *args, **kwargs):
         """
@@ -112,13 +118,18 @@ class OrderDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class OrderUpdateView(UpdateModelMixin, GenericAPIView):
+class OrderUpdateView(EagerLoadingMixin, LoggedUpdateMixin, GenericAPIView):
     """
     API endpoint for updating a single order's details.
     Accessible only by authenticated managers, or the merchandiser who placed the order.
     Supports PATCH (partial update) method.
     """
+    queryset = Order.objects.all()
     serializer_class = OrderUpdateSerializer  # Assign OrderUpdateSerializer
+    eager_loading_serializer = OrderSerializer  # Loads the items of the logged "before" snapshot
+    snapshot_serializer = OrderSerializer
+    update_log_action = 'order_updated'
+    log_detail_fields = {'order_id': 'id', 'store_name': 'store.name'}
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk'
 
@@ -128,29 +139,23 @@ class OrderUpdateView(UpdateModelMixin, GenericAPIView):
         Managers can update any order. Merchandisers can only update their own orders.
         :return: Filtered queryset of Order objects.
         """
+        queryset = super().get_queryset()
         user = self.request.user
-        if user.role == 'manager':
-            return Order.objects.all()
-        else:
-            return Order.objects.filter(merchandiser=user)
-
-    def patch(self, request, *args, **kwargs):
-        """
-        Handles PATCH requests to partially update an order.
-        Logs the update action.
-        :param request: The HTTP request object containing partial order data.
-        :return: Response with the updated order data.
-        """
-        order_before_update = OrderSerializer(self.get_object()).data
-        response = self.partial_update(request, *args, **kwargs)
-        if response.status_code == status.HTTP_200_OK:
-            updated_order_instance = self.get_object()
-            Log.objects.create(user=request.user, action='order_updated',
-                               details={'order_id': updated_order_instance.id,
-                                        'store_name': updated_order_instance.store.name,
-                                        'updated_by': request.user.username,
-                                        'old_data': order_before_update})
-        return response
+        if user.role != 'manager':
+            queryset = queryset.filter(merchandiser=user)
+        return queryset
+
+    def refresh_prefetched(self, instance, validated_data):
+        """
+        Reloads the order items, with their products, in one query when the update replaced them.
+        :param instance: The updated order.
+        :param validated_data: The validated data the order was updated with.
+        """
+        if 'items' in validated_data:
+            instance._prefetched_objects_cache = {}
+            prefetch_related_objects(
+                [instance], Prefetch('items', queryset=OrderItem.objects.select_related('product'))
+            )
 
 
 class OrderDeleteView(DestroyModelMixin, GenericAPIView):
@@ -163,6 +168,13 @@ class OrderDeleteView(DestroyModelMixin, GenericAPIView):
     permission_classes = [IsAuthenticated, IsManager]
     lookup_field = 'pk'
 
+    def get_queryset(self):
+        """
+        Joins the store, whose name is logged with the deletion.
+        :return: Queryset of Order objects.
+        """
+        return super().get_queryset().select_related('store')
+
     def delete(self, request, *args, **kwargs):
         """
         Handles DELETE requests to delete an order.
@@ -171,7 +183,7 @@ class OrderDeleteView(DestroyModelMixin, GenericAPIView):
         :return: Response indicating successful deletion.
         """
         instance = self.get_object()
-        Log.objects.create(user=request.user, action='order_deleted',
-                           details={'order_id': instance.id, 'store_name': instance.store.name,
-                                    'deleted_by': self.request.user.username})
+        log_action(user=request.user, action='order_deleted',
+                   details={'order_id': instance.id, 'store_name': instance.store.name,
+                            'deleted_by': self.request.user.username})
         return self.destroy(request, *args, **kwargs)
@@ -4,14 +4,14 @@ from rest_framework.mixins import (
     ListModelMixin,
     CreateModelMixin,
     RetrieveModelMixin,
-    UpdateModelMixin,
     DestroyModelMixin
 )
 from rest_framework.permissions import IsAuthenticated
 
-from core.models import Log
+from core.audit import log_action
 from core.permissions import IsManager
 from core.serializers.product import *
+from core.views.mixins import LoggedUpdateMixin
 
 
 class ProductListView(ListModelMixin, GenericAPIView):
@@ -51,10 +51,10 @@ class ProductCreateView(CreateModelMixin, GenericAPIView):
         response = self.create(request, *args, **kwargs)
         if response.status_code == status.HTTP_201_CREATED:
             created_product_instance = Product.objects.get(id=response.data['id'])
-            Log.objects.create(user=self.request.user, action='product_created',
-                               details={'product_name': created_product_instance.name,
-                                        'created_by': self.request.user.username,
-                                        'product_id': created_product_instance.id})
+            log_action(user=self.request.user, action='product_created',
+                       details={'product_name': created_product_instance.name,
+                                'created_by': self.request.user.username,
+                                'product_id': created_product_instance.id})
         return response
 
 
@@ -77,7 +77,7 @@ class ProductDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class ProductUpdateView(UpdateModelMixin, GenericAPIView):
+class ProductUpdateView(LoggedUpdateMixin, GenericAPIView):
     """
     API endpoint for updating a single product's details.
     Accessible only by authenticated users with 'manager' role.
@@ -85,26 +85,12 @@ class ProductUpdateView(UpdateModelMixin, GenericAPIView):
     """
     queryset = Product.objects.all()
     serializer_class = ProductUpdateSerializer
+    snapshot_serializer = ProductSerializer
+    update_log_action = 'product_updated'
+    log_detail_fields = {'product_name': 'name'}
     permission_classes = [IsAuthenticated, IsManager]
     lookup_field = 'pk'
 
-    def patch(self, request, *args, **kwargs):
-        """
-        Handles PATCH requests to partially update a product.
-        Logs the update action.
-        :param request: The HTTP request object containing partial product data.
-        :return: Response with the updated product data.
-        """
-        product_before_update = ProductSerializer(self.get_object()).data
-        response = self.partial_update(request, *args, **kwargs)
-        if response.status_code == status.HTTP_200_OK:
-            updated_product_instance = self.get_object()
-            Log.objects.create(user=self.request.user, action='product_updated',
-                               details={'product_name': updated_product_instance.name,
-                                        'updated_by': self.request.user.username,
-                                        'old_data': product_before_update})
-        return response
-
 
 class ProductDeleteView(DestroyModelMixin, GenericAPIView):
     """
@@ -124,6 +110,6 @@ class ProductDeleteView(DestroyModelMixin, GenericAPIView):
         :return: Response indicating successful deletion.
         """
         instance = self.get_object()
-        Log.objects.create(user=self.request.user, action='product_deleted',
-                           details={'product_name': instance.name, 'deleted_by': self.request.user.username})
+        log_action(user=self.request.user, action='product_deleted',
+                   details={'product_name': instance.name, 'deleted_by': self.request.user.username})
         return self.destroy(request, *args, **kwargs)
@@ -1,13 +1,32 @@
+import logging
+
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from urllib3.util.retry import Retry
 
-from core.models import Log
+from core.cache import OSRM_CACHE_MAX_POINTS, OSRM_CACHE_TIMEOUT, osrm_response_key
+from core.audit import log_action
 from core.serializers.route import *
 
+logger = logging.getLogger(__name__)
+
+# Shared HTTP session for the routing service: connections are kept alive and reused across requests
+# (and threads), so a route calculation does not pay a new TCP (and TLS) handshake every time.
+# OSRM calls are idempotent GETs, so a dropped connection is retried twice with a short backoff.
+_osrm_session = requests.Session()
+_osrm_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                            max_retries=Retry(total=2, backoff_factor=0.1, allowed_methods=['GET']))
+_osrm_session.mount('http://', _osrm_adapter)
+_osrm_session.mount('https://', _osrm_adapter)
+# Seconds to wait for the connection to be established and for the response
+OSRM_TIMEOUT = (2, 10)
+
 
 class CalculateRouteAPIView(APIView):
     """
@@ -30,12 +49,8 @@ class CalculateRouteAPIView(APIView):
         points_data = serializer.validated_data['points']
         optimize_order = serializer.validated_data['optimize_order']
 
-        coords = []
-        for store_obj in points_data:
-            coords.append(f"{store_obj.longitude},{store_obj.latitude}")
-
         # This check is also handled by RouteRequestSerializer.validate_points() (at least two points)
-        if len(coords) < 2:
+        if len(points_data) < 2:
             return Response({"detail": "At least two valid store coordinates are required for routing."},
                             status=status.HTTP_400_BAD_REQUEST)
 
@@ -49,12 +64,19 @@ class CalculateRouteAPIView(APIView):
             response_key = 'trips'
             osrm_params = "?overview=full"
 
-        osrm_url = f"{routing_url}{';'.join(coords)}{osrm_params}"
+        coords = ';'.join(f"{store_obj.longitude},{store_obj.latitude}" for store_obj in points_data)
+        osrm_url = f"{routing_url}{coords}{osrm_params}"
 
         try:
-            osrm_response = requests.get(osrm_url, timeout=10)
-            osrm_response.raise_for_status()
-            osrm_data = osrm_response.json()
+            # The same route (same stores in the same order, same options) is answered from the cache
+            cache_key = osrm_response_key(osrm_url) if len(points_data) <= OSRM_CACHE_MAX_POINTS else None
+            osrm_data = cache.get(cache_key) if cache_key else None
+            if osrm_data is None:
+                osrm_response = _osrm_session.get(osrm_url, timeout=OSRM_TIMEOUT)
+                osrm_response.raise_for_status()
+                osrm_data = osrm_response.json()
+                if cache_key and osrm_data.get('code') == 'Ok':  # Errors are not cached
+                    cache.set(cache_key, osrm_data, timeout=OSRM_CACHE_TIMEOUT)
 
             if osrm_data.get('code') != 'Ok':
                 error_detail = osrm_data.get('message', 'No specific message provided by routing service.')
@@ -106,26 +128,29 @@ class CalculateRouteAPIView(APIView):
                 'optimized': optimize_order,
             }
 
-            Log.objects.create(user=request.user, action='route_calculated',
-                               details={
-                                   'optimized': optimize_order,
-                                   'total_distance_km': total_distance_km,
-                                   'total_duration_min': total_duration_min,
-                                   'points_count': len(points_data),
-                                   'requested_store_ids': [s.id for s in points_data],
-                                   'calculated_by': request.user.username
-                               })
-
-            return Response(RouteResponseSerializer(response_data).data, status=status.HTTP_200_OK)
+            log_action(user=request.user, action='route_calculated',
+                       details={
+                           'optimized': optimize_order,
+                           'total_distance_km': total_distance_km,
+                           'total_duration_min': total_duration_min,
+                           'points_count': len(points_data),
+                           'requested_store_ids': [s.id for s in points_data],
+                           'calculated_by': request.user.username
+                       })
+
+            # response_data is built above in exactly the shape documented by RouteResponseSerializer
+            # (plain floats, strings and booleans), so it is returned as is instead of being
+            # re-walked field by field
+            return Response(response_data, status=status.HTTP_200_OK)
 
         except requests.exceptions.RequestException as e:
-            print(f"OSRM Request Exception for URL: {osrm_url} - Error: {e}")
+            logger.exception("OSRM request failed for URL: %s", osrm_url)
             return Response(
                 {"detail": f"Failed to connect to routing service or received an invalid response from OSRM: {e}",
                  "osrm_url_called": osrm_url},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
-            print(f"Unexpected error during routing for URL: {osrm_url} - Error: {e}")
+            logger.exception("Unexpected error during routing for URL: %s", osrm_url)
             return Response({"detail": f"An unexpected error occurred during routing: {e}",
                              "osrm_url_called": osrm_url},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,20 +1,49 @@
-from rest_framework import status
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import (
     ListModelMixin,
     CreateModelMixin,
     RetrieveModelMixin,
-    UpdateModelMixin,
     DestroyModelMixin
 )
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from core.models import Log
+from core.audit import log_action
 from core.permissions import IsManager
 from core.serializers.store import *
+from core.views.mixins import EagerLoadingMixin, LoggedUpdateMixin
 
 
-class StoreListView(ListModelMixin, GenericAPIView):
+def _store_list_etag(request, *args, **kwargs):
+    """
+    Computes the ETag of the store list with one aggregate query.
+    Any create or update moves the latest updated_at, and a delete changes the count.
+    :param request: The HTTP request object.
+    :return: ETag value, or None when there are no stores.
+    """
+    state = Store.objects.aggregate(count=Count('id'), last_updated=Max('updated_at'))
+    if state['last_updated'] is None:
+        return None
+    return f"{state['count']}-{state['last_updated'].timestamp()}"
+
+
+def _store_detail_etag(request, pk, *args, **kwargs):
+    """
+    Computes the ETag of a store from its updated_at, reading only that column.
+    :param request: The HTTP request object.
+    :param pk: The store ID.
+    :return: ETag value, or None when the store does not exist (retrieve() then responds with 404).
+    """
+    last_updated = Store.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if last_updated is None:
+        return None
+    return f"{pk}-{last_updated.timestamp()}"
+
+
+class StoreListView(EagerLoadingMixin, ListModelMixin, GenericAPIView):
     """
     API endpoint for listing all stores.
     Accessible by authenticated users with 'manager' or 'merchandiser' role.
@@ -23,6 +52,9 @@ class StoreListView(ListModelMixin, GenericAPIView):
     serializer_class = StoreSerializer
     permission_classes = [IsAuthenticated]  # Any authenticated user can list stores
 
+    # The ETag is checked after authentication and permissions; a matching If-None-Match gets
+    # 304 Not Modified without the stores being loaded or serialized
+    @method_decorator(condition(etag_func=_store_list_etag))
     def get(self, request, *args, **kwargs):
         """
         Handles GET requests to list all stores.
@@ -48,16 +80,21 @@ class StoreCreateView(CreateModelMixin, GenericAPIView):
         :param request: The HTTP request object containing store data.
         :return: Response with the created store data.
         """
-        response = self.create(request, *args, **kwargs)
-        if response.status_code == status.HTTP_201_CREATED:
-            store = Store.objects.get(id=response.data['id'])
-            Log.objects.create(user=request.user, action='store_created',
-                               details={'store_name': store.name,
-                                        'created_by': request.user.username})
-        return response
+        return self.create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        """
+        Saves the new store and logs the creation action.
+        The log uses the instance returned by the serializer, so the store is not fetched again.
+        :param serializer: The validated StoreCreateSerializer.
+        """
+        store = serializer.save()
+        log_action(user=self.request.user, action='store_created',
+                   details={'store_name': store.name,
+                            'created_by': self.request.user.username})
 
 
-class StoreDetailView(RetrieveModelMixin, GenericAPIView):
+class StoreDetailView(EagerLoadingMixin, RetrieveModelMixin, GenericAPIView):
     """
     API endpoint for retrieving a single store's details.
     Accessible by authenticated users with 'manager' or 'merchandiser' role.
@@ -67,6 +104,7 @@ class StoreDetailView(RetrieveModelMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]  # Any authenticated user can view store details
     lookup_field = 'pk'
 
+    @method_decorator(condition(etag_func=_store_detail_etag))
     def get(self, request, *args, **kwargs):
         """
         Handles GET requests to retrieve a single store's details.
@@ -76,7 +114,7 @@ class StoreDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class StoreUpdateView(UpdateModelMixin, GenericAPIView):
+class StoreUpdateView(EagerLoadingMixin, LoggedUpdateMixin, GenericAPIView):
     """
     API endpoint for updating a single store's details.
     Accessible only by authenticated users with 'manager' role.
@@ -84,26 +122,13 @@ class StoreUpdateView(UpdateModelMixin, GenericAPIView):
     """
     queryset = Store.objects.all()
     serializer_class = StoreUpdateSerializer
+    eager_loading_serializer = StoreSerializer  # Loads the columns of the logged "before" snapshot
+    snapshot_serializer = StoreSerializer
+    update_log_action = 'store_updated'
+    log_detail_fields = {'store_name': 'name'}
     permission_classes = [IsAuthenticated, IsManager]  # Only managers can update stores
     lookup_field = 'pk'
 
-    def patch(self, request, *args, **kwargs):
-        """
-        Handles PATCH requests to partially update a store.
-        Logs the update action.
-        :param request: The HTTP request object containing partial store data.
-        :return: Response with the updated store data.
-        """
-        store_before_update = StoreSerializer(self.get_object()).data
-        response = self.partial_update(request, *args, **kwargs)
-        if response.status_code == status.HTTP_200_OK:
-            updated_store_instance = self.get_object()
-            Log.objects.create(user=request.user, action='store_updated',
-                               details={'store_name': updated_store_instance.name,
-                                        'updated_by': request.user.username,
-                                        'old_data': store_before_update})
-        return response
-
 
 class StoreDeleteView(DestroyModelMixin, GenericAPIView):
     """
@@ -115,6 +140,13 @@ class StoreDeleteView(DestroyModelMixin, GenericAPIView):
     permission_classes = [IsAuthenticated, IsManager]  # Only managers can delete stores
     lookup_field = 'pk'
 
+    def get_queryset(self):
+        """
+        Loads only the columns needed to log the deletion.
+        :return: Queryset of Store objects.
+        """
+        return super().get_queryset().only('id', 'name')
+
     def delete(self, request, *args, **kwargs):
         """
         Handles DELETE requests to delete a store.
@@ -122,7 +154,14 @@ class StoreDeleteView(DestroyModelMixin, GenericAPIView):
         :param request: The HTTP request object.
         :return: Response indicating successful deletion.
         """
-        instance = self.get_object()
-        Log.objects.create(user=request.user, action='store_deleted',
-                           details={'store_name': instance.name, 'deleted_by': request.user.username})
         return self.destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        """
+        Logs the deletion action and deletes the store.
+        The instance is the one destroy() already fetched, so the store is loaded only once.
+        :param instance: The Store instance to delete.
+        """
+        log_action(user=self.request.user, action='store_deleted',
+                   details={'store_name': instance.name, 'deleted_by': self.request.user.username})
+        instance.delete()
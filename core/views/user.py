@@ -4,17 +4,25 @@ from rest_framework.mixins import (
     ListModelMixin,
     CreateModelMixin,
     RetrieveModelMixin,
-    UpdateModelMixin,
     DestroyModelMixin
 )
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from core.models import Log
+from core.audit import log_action
+from core.models import User
 from core.permissions import IsManager
 from core.serializers.user import *
+from core.tokens import BlacklistRefreshToken
+from core.views.mixins import EagerLoadingMixin, LoggedUpdateMixin
+
+# Shared UserSerializer for the register/login responses: calling to_representation() on it
+# renders a user without creating and binding a new serializer (and its fields) on every request.
+# It holds no per-request state, so sharing it between requests and threads is safe.
+_USER_REPRESENTATION = UserSerializer()
 
 
 class UserRegisterAPIView(APIView):
@@ -34,11 +42,11 @@ class UserRegisterAPIView(APIView):
         serializer = UserRegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            Log.objects.create(user=user, action='user_registered',
-                               details={'username': user.username, 'role': user.role})
+            log_action(user=user, action='user_registered',
+                       details={'username': user.username, 'role': user.role})
 
             return Response({
-                'user': UserSerializer(user).data,
+                'user': _USER_REPRESENTATION.to_representation(user),
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -60,10 +68,10 @@ class UserLoginAPIView(APIView):
         serializer = UserLoginSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
-        Log.objects.create(user=user, action='user_logged_in', details={'username': user.username})
+        log_action(user=user, action='user_logged_in', details={'username': user.username})
         refresh = RefreshToken.for_user(user)
         return Response({
-            'user': UserSerializer(user).data,
+            'user': _USER_REPRESENTATION.to_representation(user),
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         }, status=status.HTTP_200_OK)
@@ -84,18 +92,19 @@ class UserLogoutAPIView(APIView):
         :param request: The HTTP request object.
         :return: Response indicating successful logout.
         """
-        try:
-            Log.objects.create(user=request.user, action='user_logged_out', details={'username': request.user.username})
-            refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-            return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
-        except KeyError:
+        # The token is checked before anything is written, so a malformed request does not log a logout
+        # request.data is a dict for JSON objects and form data; any other JSON body carries no token
+        refresh_token = request.data.get("refresh") if isinstance(request.data, dict) else None
+        if not refresh_token:
             return Response({"detail": "Refresh token not provided in request body."},
                             status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
+        try:
+            BlacklistRefreshToken(refresh_token).blacklist()
+        except TokenError as e:  # Invalid, expired or already blacklisted token
             return Response({"detail": f"An error occurred during logout: {e}"},
                             status=status.HTTP_400_BAD_REQUEST)
+        log_action(user=request.user, action='user_logged_out', details={'username': request.user.username})
+        return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
 
 
 class UserListView(ListModelMixin, GenericAPIView):
@@ -107,6 +116,14 @@ class UserListView(ListModelMixin, GenericAPIView):
     serializer_class = UserSerializer  # Use UserSerializer for listing, as it's read-only
     permission_classes = [IsAuthenticated, IsManager]
 
+    def get_queryset(self):
+        """
+        Returns the user list queryset limited to the columns rendered by UserSerializer
+        (no password hash, permission flags, etc.).
+        :return: Queryset of User objects.
+        """
+        return UserSerializer.setup_eager_loading(super().get_queryset())
+
     def get(self, request, *args, **kwargs):
         """
         Handles GET requests to list all users.
@@ -116,6 +133,36 @@ class UserListView(ListModelMixin, GenericAPIView):
         return self.list(request, *args, **kwargs)
 
 
+class UserChoicesListView(ListModelMixin, GenericAPIView):
+    """
+    API endpoint for listing users as lightweight (id, username, role) entries for dropdowns and filters.
+    Accessible only by authenticated users with 'manager' role.
+    Supports filtering by role.
+    """
+    queryset = User.objects.values('id', 'username', 'role').order_by('username')
+    serializer_class = UserListSerializer
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def get_queryset(self):
+        """
+        Filters the user entries by the optional 'role' query parameter.
+        :return: Queryset of dictionaries with id, username and role.
+        """
+        queryset = super().get_queryset()
+        role = self.request.query_params.get('role')
+        if role:
+            queryset = queryset.filter(role=role)
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handles GET requests to list user choices.
+        :param request: The HTTP request object.
+        :return: Response containing a list of id/username/role entries.
+        """
+        return self.list(request, *args, **kwargs)
+
+
 class UserCreateView(CreateModelMixin, GenericAPIView):
     """
     API endpoint for creating a new user.
@@ -132,15 +179,20 @@ class UserCreateView(CreateModelMixin, GenericAPIView):
         :param request: The HTTP request object containing user data.
         :return: Response with the created user data.
         """
-        response = self.create(request, *args, **kwargs)
-        if response.status_code == status.HTTP_201_CREATED:
-            user = User.objects.get(id=response.data['id'])  # Retrieve the created user for logging
-            Log.objects.create(user=request.user, action='user_created',
-                               details={'created_username': user.username, 'created_by': request.user.username})
-        return response
+        return self.create(request, *args, **kwargs)
 
+    def perform_create(self, serializer):
+        """
+        Saves the new user and logs the creation action.
+        The log uses the instance returned by the serializer, so the user is not fetched again.
+        :param serializer: The validated UserCreateSerializer.
+        """
+        user = serializer.save()
+        log_action(user=self.request.user, action='user_created',
+                   details={'created_username': user.username, 'created_by': self.request.user.username})
 
-class UserDetailView(RetrieveModelMixin, GenericAPIView):
+
+class UserDetailView(EagerLoadingMixin, RetrieveModelMixin, GenericAPIView):
     """
     API endpoint for retrieving a single user's details.
     Accessible only by authenticated users with 'manager' role.
@@ -159,7 +211,7 @@ class UserDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class UserUpdateView(UpdateModelMixin, GenericAPIView):
+class UserUpdateView(EagerLoadingMixin, LoggedUpdateMixin, GenericAPIView):
     """
     API endpoint for updating a single user's details.
     Accessible only by authenticated users with 'manager' role.
@@ -167,26 +219,13 @@ class UserUpdateView(UpdateModelMixin, GenericAPIView):
     """
     queryset = User.objects.all()
     serializer_class = UserUpdateSerializer
+    eager_loading_serializer = UserSerializer  # Loads the columns of the logged "before" snapshot
+    snapshot_serializer = UserSerializer
+    update_log_action = 'user_updated'
+    log_detail_fields = {'updated_username': 'username'}
     permission_classes = [IsAuthenticated, IsManager]
     lookup_field = 'pk'
 
-    def patch(self, request, *args, **kwargs):
-        """
-        Handles PATCH requests to partially update a user.
-        Logs the update action.
-        :param request: The HTTP request object containing partial user data.
-        :return: Response with the updated user data.
-        """
-        user_before_update = UserSerializer(self.get_object()).data
-        response = self.partial_update(request, *args, **kwargs)
-        if response.status_code == status.HTTP_200_OK:
-            updated_user_instance = self.get_object()
-            Log.objects.create(user=request.user, action='user_updated',
-                               details={'updated_username': updated_user_instance.username,
-                                        'updated_by': request.user.username,
-                                        'old_data': user_before_update})
-        return response
-
 
 class UserDeleteView(DestroyModelMixin, GenericAPIView):
     """
@@ -198,6 +237,13 @@ class UserDeleteView(DestroyModelMixin, GenericAPIView):
     permission_classes = [IsAuthenticated, IsManager]
     lookup_field = 'pk'
 
+    def get_queryset(self):
+        """
+        Loads only the columns needed to log the deletion.
+        :return: Queryset of User objects.
+        """
+        return super().get_queryset().only('id', 'username')
+
     def delete(self, request, *args, **kwargs):
         """
         Handles DELETE requests to delete a user.
@@ -205,7 +251,14 @@ class UserDeleteView(DestroyModelMixin, GenericAPIView):
         :param request: The HTTP request object.
         :return: Response indicating successful deletion.
         """
-        instance = self.get_object()  # Get the user object before deleting for logging
-        Log.objects.create(user=request.user, action='user_deleted',
-                           details={'deleted_username': instance.username, 'deleted_by': request.user.username})
         return self.destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        """
+        Logs the deletion action and deletes the user.
+        The instance is the one destroy() already fetched, so the user is loaded only once.
+        :param instance: The User instance to delete.
+        """
+        log_action(user=self.request.user, action='user_deleted',
+                   details={'deleted_username': instance.username, 'deleted_by': self.request.user.username})
+        instance.delete()
@@ -38,6 +38,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.AuditLogBufferMiddleware',
 ]
 
 ROOT_URLCONF = 'src.urls'
@@ -70,6 +71,10 @@ DATABASES = {
         'PASSWORD': 'user_password',  # Password for the database user
         'HOST': 'localhost',  # Address of PostgreSQL server
         'PORT': '5432',  # PostgreSQL port (standard is 5432)
+        # Keep each worker thread's connection open for reuse across requests instead of reconnecting per request
+        'CONN_MAX_AGE': 60,
+        # Check a reused connection before the request that picks it up, so one dropped by the server is replaced
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -150,5 +155,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Login accepts a username or an email address (see core.backends)
+AUTHENTICATION_BACKENDS = [
+    'core.backends.EmailOrUsernameModelBackend',
+]
+
 OSRM_SERVICE_URL = 'http://router.project-osrm.org/route/v1/driving/'  # For point-to-point routing
 OSRM_OPTIMIZE_URL = 'http://router.project-osrm.org/trip/v1/driving/'  # For Traveling Salesperson Problem (TSP) optimization
@@ -35,7 +35,7 @@ const DailyPlanForm = ({initialData = {}, onSubmit, isEditMode = false, submitBu
         const fetchData = async () => {
             try {
                 if (currentUserRole === 'manager') {
-                    const usersResponse = await axios.get('/api/auth/users/?role=merchandiser', {headers: getAuthHeaders()});
+                    const usersResponse = await axios.get('/api/auth/users/choices/?role=merchandiser', {headers: getAuthHeaders()});
                     setMerchandisers(usersResponse.data);
                 }
                 const storesResponse = await axios.get('/api/auth/stores/', {headers: getAuthHeaders()});
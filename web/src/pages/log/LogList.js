@@ -6,6 +6,8 @@ import {ACTION_TYPES} from '../../common/constants';
 
 const LogList = () => {
     const [logs, setLogs] = useState([]);
+    const [nextPage, setNextPage] = useState(null); // URL of the next page of logs (null on the last page)
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [tempFilterUserId, setTempFilterUserId] = useState('');
@@ -30,8 +32,9 @@ const LogList = () => {
         }
         try {
             setLoading(true);
-            const response = await axios.get(`/api/auth/logs/${location.search}`, {headers: getAuthHeaders()}); // Fetch logs from API
-            setLogs(response.data);
+            const response = await axios.get(`/api/auth/logs/${location.search}`, {headers: getAuthHeaders()}); // Fetch first page of logs from API
+            setLogs(response.data.results);
+            setNextPage(response.data.next);
             setError(null);
         } catch (err) {
             console.error('Error fetching logs:', err);
@@ -41,10 +44,30 @@ const LogList = () => {
         }
     }, [isAuthReady, isAuthenticated, isManager, getAuthHeaders, location.search]);
 
+    // The API pages logs with a cursor; only its query string is reused so requests keep going through the proxy
+    const fetchPage = useCallback(async (pageUrl) => {
+        const response = await axios.get(`/api/auth/logs/${new URL(pageUrl).search}`, {headers: getAuthHeaders()});
+        return response.data;
+    }, [getAuthHeaders]);
+
+    const handleLoadMore = async () => { // Append the next page of logs
+        try {
+            setLoadingMore(true);
+            const data = await fetchPage(nextPage);
+            setLogs(prevLogs => [...prevLogs, ...data.results]);
+            setNextPage(data.next);
+        } catch (err) {
+            console.error('Error fetching more logs:', err);
+            setError(err.response?.data?.detail || 'Failed to fetch logs.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const fetchUsersForFilter = useCallback(async () => { // Fetch users for filter dropdown
         if (!isAuthReady || !isAuthenticated || !isManager) return;
         try {
-            const response = await axios.get('/api/auth/users/', {headers: getAuthHeaders()});
+            const response = await axios.get('/api/auth/users/choices/', {headers: getAuthHeaders()});
             setUsers(response.data);
         } catch (err) {
             console.error('Error fetching users for filter:', err);
@@ -73,12 +96,25 @@ const LogList = () => {
         navigate({search: newSearchParams.toString()}); // Update URL, which triggers fetchLogs
     };
 
-    const handleExportJson = () => { // Handle JSON export
+    const handleExportJson = async () => { // Handle JSON export of all logs matching the filters
         if (logs.length === 0) {
             alert('No logs to export.');
             return;
         }
-        const jsonString = JSON.stringify(logs, null, 4); // Stringify logs with 4-space indentation
+        let allLogs = logs;
+        try {
+            let pageUrl = nextPage;
+            while (pageUrl) { // Fetch the pages not loaded yet
+                const data = await fetchPage(pageUrl);
+                allLogs = [...allLogs, ...data.results];
+                pageUrl = data.next;
+            }
+        } catch (err) {
+            console.error('Error fetching logs for export:', err);
+            alert('Failed to fetch all logs for export.');
+            return;
+        }
+        const jsonString = JSON.stringify(allLogs, null, 4); // Stringify logs with 4-space indentation
         const now = new Date();
         const filename = `logs_export_${now.getFullYear()}-${(now.getMonth() + 1).toString().padStart(2, '0')}-${now.getDate().toString().padStart(2, '0')}_${now.getHours().toString().padStart(2, '0')}-${now.getMinutes().toString().padStart(2, '0')}-${now.getSeconds().toString().padStart(2, '0')}.json`;
 
@@ -184,6 +220,19 @@ const LogList = () => {
                     </tbody>
                 </table>
             )}
+            {nextPage && (
+                <button type="button" onClick={handleLoadMore} disabled={loadingMore} style={{
+                    marginTop: '15px',
+                    padding: '8px 15px',
+                    backgroundColor: '#6c757d',
+                    color: 'white',
+                    border: 'none',
+                    borderRadius: '5px',
+                    cursor: 'pointer'
+                }}>
+                    {loadingMore ? 'Loading...' : 'Load More'}
+                </button>
+            )}
         </div>
     );
 };